@@ -8,10 +8,12 @@
 # asincrónicas. Si el backend tarda en liberar el archivo, el UI sigue fluido.
 #
 # Cambios clave:
-# - PlayerWorker en hilo aparte (audioThread). Slots: play_path, toggle_pause,
-#   stop_all. Señales hacia UI: stateChanged, positionChanged, statusChanged,
-#   currentSourceChanged. Se recrea el QMediaPlayer “hard-switch” dentro del
-#   hilo de audio cuando cambiás de sample.
+# - PlayerWorker en hilo aparte (audioThread). Slots: play_path, prefetch_path,
+#   toggle_pause, stop_all. Señales hacia UI: stateChanged, positionChanged,
+#   statusChanged, currentSourceChanged. Tiene dos QMediaPlayer: mientras uno
+#   suena, el otro abre en segundo plano el sample siguiente (según la dirección
+#   de navegación) y al pasar a él sólo se intercambian. Los WAV cortos (one-shots)
+#   suenan con QSoundEffect (PCM ya cargado, sin armar pipeline de decodificación).
 # - En la UI ya NO se toca QMediaPlayer directamente. La navegación ↑/↓ y los
 #   clicks llaman al worker por señales (conexiones encoladas y thread-safe).
 # - Si el sample actual deja de ser visible (por filtros), se detiene audio.
@@ -21,13 +23,29 @@
 # Resultado: podés spamear ↑/↓ o clickear otros audios mientras suena, y NO se
 # congela la app ni entra en “No responde”.
 
-import os, re, sys, json, unicodedata, contextlib, wave
+import os, sys, json, stat, time, atexit, bisect, functools, hashlib, operator, threading, unicodedata, contextlib, wave
 from pathlib import Path
-from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 from PySide6 import QtCore, QtGui, QtWidgets, QtMultimedia
 import qdarkstyle
 
+try:
+    import orjson  # opcional: (de)serialización más rápida de los caches
+except ImportError:
+    orjson = None
+
+try:
+    from mutagen import File as MutagenFile  # opcional: carátulas embebidas
+except ImportError:
+    MutagenFile = None
+
+try:
+    from numba import njit  # opcional: kernel nativo para picos de WAV 24-bit
+except ImportError:
+    njit = None
+
 APP_NAME = "Lup Shots"
 APP_ORG  = "Lup"
 
@@ -36,6 +54,8 @@ VALID_EXTS = {".wav", ".aiff", ".aif", ".mp3", ".flac", ".ogg"}
 CONFIG_DIR  = Path(os.environ.get("APPDATA", Path.home() / "AppData" / "Roaming")) / APP_NAME
 CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 CONFIG_PATH = CONFIG_DIR / "config.json"
+META_CACHE_PATH = CONFIG_DIR / "meta_cache.json"
+PEAKS_CACHE_PATH = CONFIG_DIR / "peaks_cache.bin"
 
 
 # ----------------- util -----------------
@@ -44,12 +64,49 @@ def default_samples_dir() -> Path:
     return music / "Lup Samples"
 
 
+def _json_loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def _json_dumps(obj, pretty: bool = False) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, option=option)
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Último config leído/escrito: (mtime_ns del archivo, dict). Si otro proceso
+# toca config.json cambia el mtime y se vuelve a leer.
+_config_snapshot = None
+
+
+def _config_mtime():
+    try:
+        return CONFIG_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _config_copy(cfg: dict) -> dict:
+    # copia de un nivel: los llamadores reasignan claves, y las listas se copian aparte
+    return {k: (list(v) if isinstance(v, list) else v) for k, v in cfg.items()}
+
+
 def load_config():
-    if CONFIG_PATH.exists():
+    global _config_snapshot
+    mtime = _config_mtime()
+    if _config_snapshot is not None and mtime is not None and _config_snapshot[0] == mtime:
+        return _config_copy(_config_snapshot[1])
+    if mtime is not None:
         try:
-            cfg = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
+            cfg = _json_loads(CONFIG_PATH.read_bytes())
             cfg.setdefault("first_run_done", False)
             cfg.setdefault("favorites", [])
+            _config_snapshot = (mtime, _config_copy(cfg))
             return cfg
         except Exception:
             pass
@@ -57,21 +114,137 @@ def load_config():
 
 
 def save_config(cfg: dict):
+    global _config_snapshot
     cfg.setdefault("first_run_done", False)
     cfg.setdefault("favorites", [])
-    CONFIG_PATH.write_text(json.dumps(cfg, ensure_ascii=False, indent=2), encoding="utf-8")
+    mtime = _config_mtime()
+    if _config_snapshot is not None and mtime is not None and _config_snapshot == (mtime, cfg):
+        return  # igual a lo que ya está en disco
+    # escritura atómica: un cierre a mitad de camino no deja el JSON truncado
+    tmp = CONFIG_PATH.with_suffix(".tmp")
+    tmp.write_bytes(_json_dumps(cfg, pretty=True))
+    os.replace(tmp, CONFIG_PATH)
+    mtime = _config_mtime()
+    _config_snapshot = (mtime, _config_copy(cfg)) if mtime is not None else None
+
+
+# ---------- cache de metadatos parseados ----------
+# {"version": N, "entries": {ruta: {"mt": mtime_ns, "sz": size, "root": carpeta base, "meta": {...}}}}
+# Si el archivo no cambió (mismo mtime/tamaño) se evita volver a parsear. Subir
+# _META_CACHE_VERSION cuando cambie el parser invalida todo el cache.
+_META_CACHE_VERSION = 2
+_meta_cache = None
+_meta_cache_dirty = False
+
+
+def _get_meta_cache() -> dict:
+    global _meta_cache
+    if _meta_cache is None:
+        _meta_cache = {}
+        if META_CACHE_PATH.exists():
+            try:
+                data = _json_loads(META_CACHE_PATH.read_bytes())
+                if isinstance(data, dict) and data.get("version") == _META_CACHE_VERSION:
+                    _meta_cache = data.get("entries") or {}
+            except Exception:
+                pass
+    return _meta_cache
+
 
+def save_meta_cache():
+    global _meta_cache_dirty
+    if not _meta_cache_dirty or _meta_cache is None:
+        return
+    try:
+        # escritura atómica: un cierre a mitad de camino no deja el JSON truncado
+        tmp = META_CACHE_PATH.with_suffix(".tmp")
+        tmp.write_bytes(_json_dumps({"version": _META_CACHE_VERSION, "entries": _meta_cache}))
+        os.replace(tmp, META_CACHE_PATH)
+        _meta_cache_dirty = False
+    except Exception:
+        pass
 
+
+atexit.register(save_meta_cache)
+
+
+def parse_from_path_cached(path: Path, root: Path, st: os.stat_result = None):
+    """parse_from_path con cache en disco keyed por (ruta, mtime_ns, tamaño)."""
+    global _meta_cache_dirty
+    cache = _get_meta_cache()
+    try:
+        st = st or path.stat()
+    except OSError:
+        return parse_from_path(path, root)
+    key = str(path)
+    root_s = str(root)
+    hit = cache.get(key)
+    if hit and hit.get("mt") == st.st_mtime_ns and hit.get("sz") == st.st_size and hit.get("root") == root_s:
+        return hit["meta"]
+    meta = parse_from_path(path, root)
+    cache[key] = {"mt": st.st_mtime_ns, "sz": st.st_size, "root": root_s, "meta": meta}
+    _meta_cache_dirty = True
+    return meta
+
+
+def _strip_accents_nfd(s: str) -> str:
+    nf = unicodedata.normalize("NFD", s)
+    return "".join(ch for ch in nf if unicodedata.category(ch) != "Mn")
+
+
+# Latin-1 + Latin Extended (< U+0300): acento quitado por code point, precalculado.
+_STRIP_TABLE = {}
+for _cp in range(0x00C0, 0x0300):
+    _base = _strip_accents_nfd(chr(_cp))
+    if _base != chr(_cp):
+        _STRIP_TABLE[_cp] = _base
+del _cp, _base
+
+
+@functools.lru_cache(maxsize=8192)
 def strip_accents_lower(s: str) -> str:
-    nf = unicodedata.normalize("NFD", s or "")
-    return "".join(ch for ch in nf if unicodedata.category(ch) != "Mn").lower()
+    # memoizada: tags, títulos y tokens de búsqueda se repiten muchísimo.
+    # Fuera de ASCII se usa casefold ("ß" ~ "ss", "ſ" ~ "s"): haystack y tokens
+    # pasan por aquí, así que la comparación sigue siendo simétrica.
+    s = s or ""
+    if s.isascii():
+        return s.lower()
+    if max(s) < "\u0300":
+        return s.translate(_STRIP_TABLE).casefold()
+    return _strip_accents_nfd(s).casefold()
 
 
 def _clean_title_remove_trailing_number(title: str) -> str:
-    t = re.sub(r"[\s\-]*\d+\s*$", "", title).strip()
+    """Quita un número final ("Kick - 02" -> "Kick"); si no queda nada, deja el título."""
+    end = len(title.rstrip())
+    j = end
+    while j and title[j - 1].isdecimal():
+        j -= 1
+    if j < end:
+        while j and (title[j - 1].isspace() or title[j - 1] == "-"):
+            j -= 1
+    else:
+        j = len(title)
+    t = title[:j].strip()
     return t or title
 
 
+def _rel_parts(path: Path, root: Path) -> list:
+    """
+    Partes de `path` relativas a `root` (o de la ruta entera si no cuelga de él).
+    Camino rápido con cadenas: Path.relative_to crea varios objetos por archivo.
+    """
+    p, r = str(path), str(root)
+    if not r.endswith(os.sep):
+        r += os.sep
+    if p.startswith(r) and len(p) > len(r):
+        return p[len(r):].split(os.sep)
+    try:
+        return list(path.relative_to(root).parts)
+    except Exception:
+        return list(path.parts)
+
+
 def parse_from_path(path: Path, root: Path):
     """
     Parsing por CARPETAS (preferido) con fallback al formato anterior.
@@ -81,12 +254,7 @@ def parse_from_path(path: Path, root: Path):
     El nombre del archivo puede llevar:  <prefix>_X_<TITLE>_KEY_<key>_BPM_<bpm>.<ext>
     o el legado: ONESHOT_GENERO_house_X_drums_X_..._KEY_NO_BPM_120.wav
     """
-    try:
-        rel = path.relative_to(root)
-    except Exception:
-        rel = path
-
-    parts = list(rel.parts)
+    parts = _rel_parts(path, root)
     sample_type = ""
     genres, generals, specifics = [], [], []
 
@@ -113,34 +281,68 @@ def parse_from_path(path: Path, root: Path):
     if specifics:
         meta_name["specifics"] = list(dict.fromkeys(specifics + meta_name.get("specifics", [])))
 
-    meta_name["title"] = _clean_title_remove_trailing_number(meta_name.get("title", ""))
-
     return meta_name
 
 
-def _parse_filename_piecewise(filename: str):
-    base = re.sub(r"\.[^.]+$", "", filename)
-    parts = base.split("_X_")
-    pre = parts[0] if parts else ""
-    tail = parts[1] if len(parts) > 1 else ""
+# Mayúsculas sólo ASCII: conserva la longitud, así los índices sirven para el original
+_ASCII_UPPER = str.maketrans("abcdefghijklmnopqrstuvwxyz", "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
 
-    sp_from_name = [t for t in pre.split("_") if t]
 
-    mkey = re.search(r"(?:^|_)KEY_([^_]+)", tail, flags=re.I)
-    key = (mkey.group(1).upper() if mkey else "").strip()
+def _clean(s) -> str:
+    return (s or "").strip()
+
+
+def _strip_ext(filename: str) -> str:
+    stem, dot, ext = filename.rpartition(".")
+    return stem if (dot and ext) else filename
+
+
+def _tag_value(tail: str, upper: str, tag: str) -> str:
+    """Texto tras `tag` (p.ej. "KEY_") al inicio o después de "_", hasta el siguiente "_"."""
+    i = upper.find(tag)
+    while i >= 0:
+        if i == 0 or tail[i - 1] == "_":
+            val = tail[i + len(tag):].partition("_")[0]
+            if val:
+                return val
+        i = upper.find(tag, i + 1)
+    return ""
+
+
+def _parse_tail(tail: str, base: str):
+    """
+    Cola del nombre: <TITLE>_KEY_<key>_BPM_<bpm> (KEY/BPM opcionales, sin importar
+    mayúsculas). Devuelve (key, bpm, title).
+    """
+    upper = tail.upper() if tail.isascii() else tail.translate(_ASCII_UPPER)
+
+    key = _tag_value(tail, upper, "KEY_").upper().strip()
     key = "" if (not key or key == "NO") else key
 
-    mbpm = re.search(r"(?:^|_)BPM_([^_]+)", tail, flags=re.I)
     bpm = 0
-    if mbpm:
-        bpm_txt = mbpm.group(1).strip()
-        if bpm_txt.upper() != "NO" and bpm_txt.isdigit():
-            bpm = int(bpm_txt)
+    bpm_txt = _tag_value(tail, upper, "BPM_").strip()
+    if bpm_txt.upper() != "NO" and bpm_txt.isdigit():
+        bpm = int(bpm_txt)
+
+    # Se corta en "_KEY_" y luego en el primer "_BPM_" completo que quede antes
+    cut = upper.find("_KEY_")
+    if cut < 0:
+        cut = len(tail)
+    i = upper.find("_BPM_", 0, cut)
+    if i >= 0:
+        cut = i
+    title = _clean_title_remove_trailing_number(tail[:cut].replace("_", " ").strip() or base)
+
+    return key, bpm, title
+
+
+def _parse_filename_piecewise(filename: str):
+    base = _strip_ext(filename)
+    pre, _, rest = base.partition("_X_")
+    tail = rest.partition("_X_")[0]
 
-    title = tail
-    title = re.sub(r"_KEY_.*", "", title, flags=re.I)
-    title = re.sub(r"_BPM_.*", "", title, flags=re.I)
-    title = title.replace("_", " ").strip() or base
+    sp_from_name = [t for t in pre.split("_") if t]
+    key, bpm, title = _parse_tail(tail, base)
 
     return dict(
         sample_type="", genres=[], generals=[], specifics=sp_from_name,
@@ -149,45 +351,32 @@ def _parse_filename_piecewise(filename: str):
 
 
 def _parse_legacy_filename(filename: str):
-    base = re.sub(r"\.[^.]+$", "", filename)
+    base = _strip_ext(filename)
 
     sample_type = ""
-    if base.upper().startswith("ONESHOT_"):
+    head = base[:8].upper()
+    if head.startswith("ONESHOT_"):
         sample_type = "oneshot"
         base = base[len("ONESHOT_"):]
-    elif base.upper().startswith("LOOP_"):
+    elif head.startswith("LOOP_"):
         sample_type = "loop"
         base = base[len("LOOP_"):]
 
-    parts = base.split("_X_")
+    parts = base.split("_X_", 3)
 
-    def clean(s): return (s or "").strip()
-    graw = clean(parts[0] if len(parts) > 0 else "")
-    genres = [t for t in re.sub(r"^GENERO_", "", graw, flags=re.I).split("_") if t]
+    graw = _clean(parts[0] if len(parts) > 0 else "")
+    if graw[:7].upper() == "GENERO_":
+        graw = graw[7:]
+    genres = [t for t in graw.split("_") if t]
 
-    gr = clean(parts[1] if len(parts) > 1 else "")
+    gr = _clean(parts[1] if len(parts) > 1 else "")
     generals = [t for t in gr.split("_") if t]
 
-    sp = clean(parts[2] if len(parts) > 2 else "")
+    sp = _clean(parts[2] if len(parts) > 2 else "")
     specifics = [t for t in sp.split("_") if t]
 
-    tail = "_X_".join(parts[3:]) if len(parts) > 3 else ""
-
-    mkey = re.search(r"(?:^|_)KEY_([^_]+)", tail, flags=re.I)
-    key = (mkey.group(1).upper() if mkey else "").strip()
-    key = "" if (not key or key == "NO") else key
-
-    mbpm = re.search(r"(?:^|_)BPM_([^_]+)", tail, flags=re.I)
-    bpm = 0
-    if mbpm:
-        bpm_txt = mbpm.group(1).strip()
-        if bpm_txt.upper() != "NO" and bpm_txt.isdigit():
-            bpm = int(bpm_txt)
-
-    title = tail
-    title = re.sub(r"_KEY_.*", "", title, flags=re.I)
-    title = re.sub(r"_BPM_.*", "", title, flags=re.I)
-    title = title.replace("_", " ").strip() or base
+    tail = parts[3] if len(parts) > 3 else ""
+    key, bpm, title = _parse_tail(tail, base)
 
     return dict(
         sample_type=sample_type, genres=genres, generals=generals, specifics=specifics,
@@ -195,60 +384,338 @@ def _parse_legacy_filename(filename: str):
     )
 
 
-def read_pcm_waveform(path: Path, peaks=160):
+# dtype de numpy por ancho de muestra PCM (el de 24 bits se arma a mano)
+_PCM_DTYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+
+def _block_peaks(raw: bytes, sampwidth: int, n_channels: int, blocks: int):
+    """
+    Máximo |x| del canal 0 por bloque, reducido sobre los enteros PCM tal cual (la
+    vista por canal se reacomoda en bloques sin copiar y sólo los `blocks` resultados
+    pasan a float). Sin normalizar. None si el ancho de muestra no es soportado.
+    """
+    n_channels = max(1, n_channels)
+    frame_bytes = sampwidth * n_channels
+    if sampwidth == 3:
+        # 24-bit no tiene dtype: se arma int32 sólo con los 3 bytes del canal 0
+        a = np.frombuffer(raw, dtype=np.uint8, count=len(raw) // frame_bytes * frame_bytes).reshape(-1, frame_bytes)
+        ch0 = (a[:, 0].astype(np.int32)
+               | (a[:, 1].astype(np.int32) << 8)
+               | (a[:, 2].astype(np.int8).astype(np.int32) << 16))
+    elif sampwidth in _PCM_DTYPES:
+        ch0 = np.frombuffer(raw, dtype=_PCM_DTYPES[sampwidth], count=len(raw) // frame_bytes * n_channels)[::n_channels]
+    else:
+        return None
+    if sampwidth == 1:
+        ch0 = ch0.astype(np.int16) - 128  # WAV de 8 bits es unsigned (silencio = 128)
+    if not ch0.size:
+        return np.zeros(blocks, dtype=np.float32)
+    # Un bloque = `step` frames; se rellena con silencio si el archivo es más corto
+    step = max(1, ch0.size // blocks)
+    need = blocks * step
+    if ch0.size < need:
+        ch0 = np.concatenate([ch0, np.zeros(need - ch0.size, dtype=ch0.dtype)])
+    v = ch0[:need].reshape(blocks, step)
+    # max/min en vez de abs: evita el desborde de abs(-32768) en int16
+    return np.maximum(v.max(axis=1).astype(np.float32), -v.min(axis=1).astype(np.float32))
+
+
+if njit is not None:
+    @njit(cache=True, boundscheck=False, nogil=True)
+    def _peaks_24bit(buf, n_channels, step, blocks, out):
+        """Decodifica 24-bit (canal 0) y saca el máximo |x| por bloque en una pasada."""
+        frame_bytes = 3 * n_channels
+        n = buf.size // frame_bytes
+        for i in range(blocks):
+            m = 0
+            stop = min((i + 1) * step, n)
+            for f in range(i * step, stop):
+                o = f * frame_bytes
+                v = np.int32(buf[o]) | (np.int32(buf[o + 1]) << 8) | (np.int32(buf[o + 2]) << 16)
+                if v & 0x800000:
+                    v -= 0x1000000
+                if v < 0:
+                    v = -v
+                if v > m:
+                    m = v
+            out[i] = m / 8388608.0
+else:
+    _peaks_24bit = None
+
+
+def _wav_data_offset(f) -> int:
+    """Offset en bytes del chunk "data" de un RIFF/WAVE (ya validado por `wave`); -1 si no está."""
+    f.seek(12)
+    while True:
+        head = f.read(8)
+        if len(head) < 8:
+            return -1
+        size = int.from_bytes(head[4:], "little")
+        if head[:4] == b"data":
+            return f.tell()
+        f.seek(size + (size & 1), 1)  # los chunks se alinean a 2 bytes
+
+
+def _map_pcm(f, offset: int, nbytes: int):
+    """
+    Vista uint8 de `nbytes` de PCM desde `offset` vía memmap: sin read() ni copias,
+    el kernel pagina sólo lo que se toca. Se recorta si el archivo viene truncado.
+    """
+    nbytes = max(0, min(nbytes, os.fstat(f.fileno()).st_size - offset))
+    if nbytes < WAVE_MMAP_MIN_BYTES:
+        f.seek(offset)  # en archivos chicos armar el mapeo cuesta más que leerlos
+        return np.frombuffer(f.read(nbytes), dtype=np.uint8)
+    return np.memmap(f, dtype=np.uint8, mode="r", offset=offset, shape=(nbytes,))
+
+
+def _windowed_peaks(pcm, sampwidth: int, n_channels: int, n_frames: int, blocks: int, step: int):
+    """
+    Pico aproximado por bloque mirando sólo WAVE_WINDOW_FRAMES frames alrededor
+    de su centro. Las ventanas salen de una sola indexación sobre el PCM mapeado
+    y se reducen todas en una pasada de NumPy. Sin normalizar. None si el formato
+    no se decodifica.
+    """
+    window = WAVE_WINDOW_FRAMES
+    frame_bytes = sampwidth * max(1, n_channels)
+    window_bytes = window * frame_bytes
+    centers = np.arange(blocks) * step + step // 2
+    starts = np.maximum(np.minimum(centers - window // 2, n_frames - window), 0) * frame_bytes
+    if pcm.size >= n_frames * frame_bytes:
+        views = np.lib.stride_tricks.sliding_window_view(pcm[:n_frames * frame_bytes], window_bytes)
+        raw = views[starts].reshape(-1)  # copia sólo las ventanas
+    else:
+        # archivo truncado: lo que falta cuenta como silencio (8 bits es unsigned)
+        raw = np.full((blocks, window_bytes), 128 if sampwidth == 1 else 0, dtype=np.uint8)
+        for i, start in enumerate(starts[starts < pcm.size].tolist()):
+            chunk = pcm[start:start + window_bytes]
+            raw[i, :chunk.size] = chunk
+        raw = raw.reshape(-1)
+    if sampwidth == 3 and _peaks_24bit is not None:
+        # 24-bit: el kernel nativo decodifica y reduce sin arrays intermedios
+        out = np.zeros(blocks, dtype=np.float32)
+        _peaks_24bit(raw, max(1, n_channels), window, blocks, out)
+        return out
+    return _block_peaks(raw, sampwidth, n_channels, blocks)  # bloque = una ventana
+
+
+WAVE_PPS = 150          # picos por segundo de audio
+WAVE_MAX_POINTS = 512   # tope de picos por archivo (acota CPU/memoria en audios largos)
+WAVE_SEEK_MIN_SECONDS = 10.0  # desde esta duración se leen ventanas, no el archivo entero
+WAVE_WINDOW_FRAMES = 4096     # frames leídos alrededor del centro de cada bloque
+WAVE_MMAP_MIN_BYTES = 1 << 16  # PCM más chico que esto se lee con read() en vez de memmap
+
+
+def read_pcm_waveform(path: Path, pps=WAVE_PPS, max_points=WAVE_MAX_POINTS):
     """
-    Devuelve (peaks:list[float] or None, duration:float, sample_rate:int|0, bit_depth:int|0)
-    Solo WAV PCM. Otros formatos: (None, 0.0, 0, 0)
+    Devuelve (peaks:np.ndarray[float32] or None, duration:float, sample_rate:int|0, bit_depth:int|0)
+    Un pico cada 1/pps segundos, como máximo `max_points`; el widget los remuestrea
+    a su ancho. Solo WAV PCM. Otros formatos: (None, 0.0, 0, 0)
     """
     try:
         if path.suffix.lower() != ".wav":
             return None, 0.0, 0, 0
-        with contextlib.closing(wave.open(str(path), "rb")) as wf:
-            n_channels = wf.getnchannels()
-            n_frames = wf.getnframes()
-            framerate = wf.getframerate()
-            sampwidth = wf.getsampwidth()
-            duration = (n_frames / float(framerate)) if framerate else 0.0
-            bit_depth = sampwidth * 8
-            sample_rate = framerate
-
-            blocks = max(1, peaks)
-            step = max(1, n_frames // blocks)
-            import struct
-            out = []
-            for i in range(blocks):
-                wf.setpos(min(i * step, n_frames - 1))
-                frames = wf.readframes(min(step, n_frames - i * step))
-                if sampwidth == 3:
-                    samples = []
-                    stride = 3 * n_channels
-                    for j in range(0, len(frames) - stride + 1, stride):
-                        chunk = frames[j:j + 3]
-                        b = int.from_bytes(chunk, "little", signed=True)
-                        samples.append(abs(b) / float(2 ** 23))
-                else:
-                    fmt_char = {1: "b", 2: "h", 4: "i"}.get(sampwidth)
-                    if not fmt_char:
-                        out.append(0.0)
-                        continue
-                    fmt = "<" + fmt_char * (len(frames) // sampwidth)
-                    ints = struct.unpack(fmt, frames)
-                    ch0 = ints[0::n_channels] if n_channels > 0 else ints
-                    max_val = float(2 ** (bit_depth - 1))
-                    samples = [abs(x) / (max_val or 1.0) for x in ch0]
-                peak = max(samples) if samples else 0.0
-                out.append(peak)
-            mx = max(out) if out else 1.0
-            peaks_norm = [p / (mx or 1.0) for p in out]
-            return peaks_norm, duration, sample_rate, bit_depth
+        # `wave` valida y lee el encabezado; el PCM se mapea directo del mismo archivo
+        with open(path, "rb") as f:
+            with contextlib.closing(wave.open(f)) as wf:
+                n_channels = wf.getnchannels()
+                n_frames = wf.getnframes()
+                framerate = wf.getframerate()
+                sampwidth = wf.getsampwidth()
+            offset = _wav_data_offset(f)
+            if offset < 0:
+                return None, 0.0, 0, 0
+            raw = _map_pcm(f, offset, n_frames * sampwidth * max(1, n_channels))
+        duration = (n_frames / float(framerate)) if framerate else 0.0
+        bit_depth = sampwidth * 8
+        sample_rate = framerate
+        blocks = min(max_points, max(1, int(duration * pps)))
+        step = n_frames // blocks
+        if duration >= WAVE_SEEK_MIN_SECONDS and step > WAVE_WINDOW_FRAMES:
+            out = _windowed_peaks(raw, sampwidth, n_channels, n_frames, blocks, step)
+            if out is not None:
+                mx = float(out.max())
+                if mx > 0:
+                    out /= mx
+                return out, duration, sample_rate, bit_depth
+
+        if sampwidth == 3 and _peaks_24bit is not None:
+            buf = np.frombuffer(raw, dtype=np.uint8)
+            n = buf.size // (3 * max(1, n_channels))
+            out = np.zeros(blocks, dtype=np.float32)
+            _peaks_24bit(buf, max(1, n_channels), max(1, n // blocks), blocks, out)
+            mx = float(out.max())
+            if mx > 0:
+                out /= mx
+            return out, duration, sample_rate, bit_depth
+
+        out = _block_peaks(raw, sampwidth, n_channels, blocks)
+        if out is None:
+            return np.zeros(blocks, dtype=np.float32), duration, sample_rate, bit_depth
+        mx = float(out.max())
+        if mx > 0:
+            out /= mx
+        return out, duration, sample_rate, bit_depth
     except Exception:
         return None, 0.0, 0, 0
 
 
+# ---------- cache de picos en disco (binario) ----------
+# b"LUPK" + uint32 versión + uint32 N, luego N registros _PEAKS_REC y al final todos
+# los picos como float16 contiguos. Se lee entero con np.fromfile y cada entrada es
+# una vista sobre ese buffer (sin copiar ni parsear floats).
+_PEAKS_MAGIC = b"LUPK"
+_PEAKS_VERSION = 2
+_PEAKS_REC = np.dtype([("key", "<u8"), ("dur", "<f8"), ("sr", "<u4"),
+                       ("bd", "<u2"), ("n", "<u2"), ("off", "<u4")])
+_PEAKS_MAX_ENTRIES = 50000
+_peaks_cache = None  # {key: (peaks float16, duración, sample_rate, bit_depth)}
+_peaks_cache_dirty = False
+_peaks_lock = threading.Lock()  # los picos se calculan desde el QThreadPool
+
+
+def _peaks_key(path_str: str, mtime_ns: int, size: int) -> int:
+    raw = f"{path_str}\0{mtime_ns}\0{size}".encode("utf-8", "surrogatepass")
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "little")
+
+
+def _get_peaks_cache() -> dict:
+    global _peaks_cache
+    with _peaks_lock:
+        if _peaks_cache is None:
+            _peaks_cache = {}
+            try:
+                if PEAKS_CACHE_PATH.exists():
+                    data = np.fromfile(PEAKS_CACHE_PATH, dtype=np.uint8)
+                    if data[:4].tobytes() == _PEAKS_MAGIC:
+                        version, n = np.frombuffer(data, dtype="<u4", count=2, offset=4).tolist()
+                        if version == _PEAKS_VERSION:
+                            start = 12 + n * _PEAKS_REC.itemsize
+                            recs = np.frombuffer(data, dtype=_PEAKS_REC, count=n, offset=12)
+                            blob = np.frombuffer(data, dtype="<f2", count=(data.size - start) // 2, offset=start)
+                            for key, dur, sr, bd, cnt, off in recs.tolist():
+                                _peaks_cache[key] = (blob[off:off + cnt], dur, sr, bd)
+            except Exception:
+                _peaks_cache = {}
+        return _peaks_cache
+
+
+_peaks_save_lock = threading.Lock()  # una escritura a la vez (hilo de guardado / atexit)
+
+
+def save_peaks_cache():
+    global _peaks_cache_dirty
+    with _peaks_save_lock:
+        with _peaks_lock:
+            if not _peaks_cache_dirty or _peaks_cache is None:
+                return
+            items = list(_peaks_cache.items())[-_PEAKS_MAX_ENTRIES:]
+            # se baja antes de escribir: lo que llegue mientras tanto vuelve a marcarlo
+            _peaks_cache_dirty = False
+        try:
+            _write_peaks_file(items)
+        except Exception:
+            _peaks_cache_dirty = True
+
+
+def save_peaks_cache_async():
+    """save_peaks_cache en un hilo aparte (con 50k entradas son ~100 ms)."""
+    if _peaks_cache_dirty:
+        threading.Thread(target=save_peaks_cache, name="peaks-cache-save", daemon=True).start()
+
+
+def _write_peaks_file(items: list):
+    recs = np.zeros(len(items), dtype=_PEAKS_REC)
+    off = 0
+    for i, (key, (pk, dur, sr, bd)) in enumerate(items):
+        recs[i] = (key, dur, sr, bd, pk.size, off)
+        off += pk.size
+    blob = np.concatenate([it[1][0] for it in items]) if items else np.zeros(0, dtype="<f2")
+    tmp = PEAKS_CACHE_PATH.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_PEAKS_MAGIC)
+        f.write(np.array([_PEAKS_VERSION, len(items)], dtype="<u4").tobytes())
+        f.write(recs.tobytes())
+        f.write(blob.astype("<f2").tobytes())
+    os.replace(tmp, PEAKS_CACHE_PATH)
+
+
+atexit.register(save_peaks_cache)
+
+
+def _touch_peaks(cache: dict, key: int):
+    """Entrada de `cache` movida al final: el orden del dict queda de menos a más
+    reciente y save_peaks_cache descarta por el principio (LRU entre sesiones)."""
+    with _peaks_lock:
+        hit = cache.pop(key, None)
+        if hit is not None:
+            cache[key] = hit
+    return hit
+
+
+def cached_waveform(path_str: str, st: os.stat_result):
+    """(picos float16, duración, rate, bits) si ya están en el cache de disco, si no None."""
+    return _touch_peaks(_get_peaks_cache(), _peaks_key(path_str, st.st_mtime_ns, st.st_size))
+
+
+@functools.lru_cache(maxsize=4096)
+def _read_pcm_waveform_lru(path_str: str, mtime_ns: int, size: int):
+    # se devuelve el mismo float16 del cache de disco (sin copia float32): info,
+    # este LRU y el cache comparten un solo array; WaveWidget lo pasa a float32
+    global _peaks_cache_dirty
+    key = _peaks_key(path_str, mtime_ns, size)
+    cache = _get_peaks_cache()
+    hit = _touch_peaks(cache, key)
+    if hit is not None:
+        return hit
+    res = read_pcm_waveform(Path(path_str))
+    if res[0] is not None:
+        res = (res[0].astype("<f2"),) + tuple(res[1:])
+        with _peaks_lock:
+            cache[key] = res
+            _peaks_cache_dirty = True
+    return res
+
+
+def read_pcm_waveform_cached(path: Path):
+    """
+    read_pcm_waveform con LRU en memoria y cache binario en disco, keyed por (ruta,
+    mtime, tamaño). Los picos salen como float16, igual que de cached_waveform.
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return None, 0.0, 0, 0
+    return _read_pcm_waveform_lru(str(path), st.st_mtime_ns, st.st_size)
+
+
+# ---------- colores / pinceles compartidos (se crean una vez) ----------
+_PLACEHOLDER_BG = QtGui.QColor("#1f2937")
+_PLACEHOLDER_FG = QtGui.QColor("#e5e7eb")
+_WAVE_PLAYED = QtGui.QBrush(QtGui.QColor("#e5e7eb"))
+_WAVE_REMAIN = QtGui.QBrush(QtGui.QColor("#a1a1aa"))
+
+
+@functools.lru_cache(maxsize=None)
+def _placeholder_font() -> QtGui.QFont:
+    # QFont necesita la QApplication creada: se arma en el primer uso
+    font = QtGui.QFont()
+    font.setPointSize(8)
+    font.setBold(True)
+    return font
+
+
 # ---------- Cover art util (opcional con mutagen) ----------
-def load_cover_pixmap(path: Path) -> QtGui.QPixmap or None:
+COVER_SIZE = 40
+
+
+def load_cover_image(path: Path, size: int = COVER_SIZE) -> QtGui.QImage or None:
+    """
+    Carátula embebida ya escalada a `size`. Devuelve QImage (no QPixmap) para que
+    se pueda llamar desde hilos de escaneo; la UI la convierte a QPixmap.
+    """
+    if MutagenFile is None:
+        return None
     try:
-        from mutagen import File as MutagenFile
         audio = MutagenFile(str(path))
         if audio is None:
             return None
@@ -264,91 +731,678 @@ def load_cover_pixmap(path: Path) -> QtGui.QPixmap or None:
         if data is None and hasattr(audio, "pictures") and audio.pictures:
             data = audio.pictures[0].data
         if data:
-            img = QtGui.QImage.fromData(data)
-            if not img.isNull():
-                return QtGui.QPixmap.fromImage(img)
+            return _decode_cover(bytes(data), size)
     except Exception:
         return None
     return None
 
 
+_covers_by_digest = {}  # {(hash de los bytes embebidos, size): QImage | None}
+_covers_lock = threading.Lock()
+
+
+def _decode_cover(data: bytes, size: int):
+    """
+    Decodifica y escala una carátula una sola vez por contenido: un pack con la
+    misma imagen en cada archivo comparte el mismo QImage (y por ende el QPixmap).
+    """
+    k = (hashlib.blake2b(data, digest_size=16).digest(), size)
+    with _covers_lock:
+        if k in _covers_by_digest:
+            return _covers_by_digest[k]
+    img = QtGui.QImage.fromData(data)
+    img = None if img.isNull() else img.scaled(size, size, QtCore.Qt.KeepAspectRatio,
+                                               QtCore.Qt.SmoothTransformation)
+    with _covers_lock:
+        return _covers_by_digest.setdefault(k, img)
+
+
+@functools.lru_cache(maxsize=4096)
+def _load_cover_image_lru(path_str: str, mtime_ns: int, size: int):
+    return load_cover_image(Path(path_str), size)
+
+
+def load_cover_image_cached(path: Path, st: os.stat_result = None, size: int = COVER_SIZE):
+    """
+    load_cover_image con LRU keyed por (ruta, mtime): re-escanear no reabre el archivo.
+    Además la entrada del cache de metadatos recuerda ("cv") si el archivo tiene
+    carátula: en el arranque siguiente los que no tienen ni se abren.
+    """
+    global _meta_cache_dirty
+    try:
+        st = st or path.stat()
+    except OSError:
+        return None
+    key = str(path)
+    hit = _get_meta_cache().get(key)
+    if hit is not None and (hit.get("mt") != st.st_mtime_ns or hit.get("sz") != st.st_size):
+        hit = None
+    if hit is not None and hit.get("cv") is False:
+        return None
+    img = _load_cover_image_lru(key, st.st_mtime_ns, size)
+    if hit is not None and MutagenFile is not None and "cv" not in hit:
+        hit["cv"] = img is not None
+        _meta_cache_dirty = True
+    return img
+
+
+def cover_pixmap(info: dict, size: int = COVER_SIZE) -> QtGui.QPixmap:
+    """
+    QPixmap de la carátula de `info` vía QPixmapCache. La clave es el cacheKey del
+    QImage, que ya es compartido entre archivos con la misma carátula embebida.
+    Sin carátula, placeholder por extensión.
+    """
+    img = info.get("cover")
+    if img is None:
+        return placeholder_pixmap(os.path.splitext(info["filename"])[1], size)
+    key = f"cover:{img.cacheKey()}:{size}"
+    pm = QtGui.QPixmap()
+    if QtGui.QPixmapCache.find(key, pm):
+        return pm
+    pm = QtGui.QPixmap.fromImage(img)
+    QtGui.QPixmapCache.insert(key, pm)
+    return pm
+
+
+_placeholders = {}
+
+
 def placeholder_pixmap(ext: str, size: int = 40) -> QtGui.QPixmap:
+    """Placeholder con la extensión; una sola instancia por (ext, size)."""
+    k = ((ext or "").lower(), size)
+    pm = _placeholders.get(k)
+    if pm is None:
+        pm = _placeholders[k] = _render_placeholder(ext, size)
+    return pm
+
+
+def _render_placeholder(ext: str, size: int) -> QtGui.QPixmap:
     pm = QtGui.QPixmap(size, size)
-    pm.fill(QtGui.QColor("#1f2937"))
+    pm.fill(_PLACEHOLDER_BG)
     p = QtGui.QPainter(pm)
-    p.setPen(QtGui.QColor("#e5e7eb"))
-    font = QtGui.QFont()
-    font.setPointSize(8)
-    font.setBold(True)
-    p.setFont(font)
+    p.setPen(_PLACEHOLDER_FG)
+    p.setFont(_placeholder_font())
     text = (ext or "").lstrip(".").upper()[:4] or "AUDIO"
     p.drawText(pm.rect(), QtCore.Qt.AlignCenter, text)
     p.end()
     return pm
 
 
+# ----------------- escaneo de la librería -----------------
+# Carpetas de sistema que nunca tienen samples y pueden ser enormes (papelera, etc.)
+SKIP_DIRS = {"$recycle.bin", "system volume information", "__macosx"}
+# En Windows, DirEntry.stat() trae los atributos del listado: oculto/sistema sin syscall extra
+_HIDDEN_ATTRS = (getattr(stat, "FILE_ATTRIBUTE_HIDDEN", 0) | getattr(stat, "FILE_ATTRIBUTE_SYSTEM", 0)) if os.name == "nt" else 0
+
+
+def _is_hidden(e) -> bool:
+    """Entrada oculta: empieza por "." (incluye los ._* de macOS) o lleva atributo oculto/sistema."""
+    if e.name.startswith("."):
+        return True
+    if _HIDDEN_ATTRS:
+        return bool(getattr(e.stat(follow_symlinks=False), "st_file_attributes", 0) & _HIDDEN_ATTRS)
+    return False
+
+
+def walk_audio(root: Path):
+    """
+    Recorre `root` con os.scandir (pila, sin recursión) y produce (ruta:str, stat)
+    por cada audio. DirEntry.stat() viene del propio listado en Windows, así que
+    no hay un syscall extra por archivo. Se saltan entradas ocultas y carpetas de sistema.
+    """
+    stack = [str(root)]
+    while stack:
+        d = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    try:
+                        if _is_hidden(e):
+                            continue
+                        if e.is_dir(follow_symlinks=False):
+                            if e.name.lower() not in SKIP_DIRS:
+                                stack.append(e.path)
+                            continue
+                        name = e.name
+                        dot = name.rfind(".")
+                        if dot > 0 and name[dot:].lower() in VALID_EXTS and e.is_file():
+                            yield e.path, e.stat()
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def collect_audio_files(root: Path) -> list:
+    """
+    Lista ordenada de (ruta:str, os.stat_result) de todos los audios bajo `root`.
+    Sin un Path por archivo: sólo lo arma _scan_one para los que hay que abrir.
+    """
+    entries = list(walk_audio(root))
+    entries.sort(key=operator.itemgetter(0))
+    return entries
+
+
+def _scan_one(path_str: str, root: Path, st: os.stat_result = None) -> dict:
+    path = Path(path_str)
+    if st is None:
+        try:
+            st = path.stat()
+        except OSError:
+            st = None
+    return {
+        "path_str": path_str,
+        "mtime": st.st_mtime_ns if st is not None else 0,
+        "meta": parse_from_path_cached(path, root, st),
+        "cover": load_cover_image_cached(path, st),
+        "wave": cached_waveform(path_str, st) if st is not None else None,
+    }
+
+
+def _scan_one_cached(path_str: str, root_s: str, st: os.stat_result):
+    """
+    Lo mismo que _scan_one pero sólo si todo sale de los caches sin abrir el archivo
+    (metadatos al día y sin carátula, o sin mutagen); si no, None.
+    """
+    hit = _get_meta_cache().get(path_str)
+    if (hit is None or hit.get("mt") != st.st_mtime_ns or hit.get("sz") != st.st_size
+            or hit.get("root") != root_s):
+        return None
+    if MutagenFile is not None and hit.get("cv") is not False:
+        return None
+    return {"path_str": path_str, "mtime": st.st_mtime_ns, "meta": hit["meta"], "cover": None,
+            "wave": cached_waveform(path_str, st)}
+
+
+def scan_library(root: Path, entries=None):
+    """
+    Parsea metadatos y carátula de cada audio en un pool de hilos (la lectura de
+    disco libera el GIL). Los picos de onda se calculan después, a demanda.
+    `entries` = [(ruta:str, stat)] como los da collect_audio_files; se conserva el orden.
+    Es un generador: cada resultado se entrega apenas está listo, así quien
+    consume (armado de `info` en la UI) trabaja en paralelo con los hilos.
+    Lo que sale entero de los caches se resuelve acá mismo; al pool sólo van los
+    archivos que hay que abrir (en un arranque tibio, casi ninguno).
+    """
+    if entries is None:
+        entries = collect_audio_files(root)
+    if not entries:
+        return
+    _get_meta_cache()  # cargar los caches una sola vez, antes de abrir los hilos
+    _get_peaks_cache()
+    root_s = str(root)
+    quick = [_scan_one_cached(p, root_s, st) if st is not None else None for p, st in entries]
+    misses = [e for e, res in zip(entries, quick) if res is None]
+    if not misses:
+        yield from quick
+        return
+    workers = min(32, (os.cpu_count() or 1) * 4, len(misses))
+    ex = ThreadPoolExecutor(max_workers=workers)
+    try:
+        slow = ex.map(lambda e: _scan_one(e[0], root, e[1]), misses)
+        for res in quick:
+            yield res if res is not None else next(slow)
+    finally:
+        # si quien consume corta antes (escaneo cancelado), no procesar el resto
+        ex.shutdown(wait=True, cancel_futures=True)
+
+
+def sample_info(res: dict) -> dict:
+    """`info` de una muestra (lo que usan la lista, los filtros y el player) a partir
+    de un resultado de _scan_one. Puede correr fuera del hilo UI; falta "idx"."""
+    path_str, meta = res["path_str"], res["meta"]
+    tags_flat = list(meta["genres"] + meta["generals"] + meta["specifics"])
+    if meta["key"]:
+        tags_flat.append(meta["key"])
+    if meta["sample_type"]:
+        tags_flat.append(meta["sample_type"])
+    if meta["bpm"]:
+        tags_flat.append(str(meta["bpm"]))
+    # se normaliza por partes para que los tags repetidos peguen en el caché
+    title_key = strip_accents_lower(meta["title"])
+    name = os.path.basename(path_str)
+    hay = " ".join([*map(strip_accents_lower, tags_flat), title_key, strip_accents_lower(name)])
+    # sin QUrl ni Path por muestra (~200 B c/u en bibliotecas enormes): el drag y
+    # los picos los arman al momento desde path_str
+    info = {
+        "path_str": path_str, "filename": name,
+        "genres": meta["genres"], "generals": meta["generals"], "specifics": meta["specifics"],
+        "title": meta["title"], "key": meta["key"],
+        "sample_type": meta["sample_type"], "bpm": meta["bpm"],
+        "haystack": hay, "tagset": set(tags_flat),
+        "title_key": title_key,
+        "peaks": None, "duration_ms": 0,
+        "sample_rate": 0, "bit_depth": 0, "peaks_ready": False,
+        "cover": res["cover"], "mtime": res["mtime"],
+    }
+    if res["wave"] is not None:
+        peaks, duration, sample_rate, bit_depth = res["wave"]
+        info.update(peaks=peaks, duration_ms=int(duration * 1000),
+                    sample_rate=sample_rate, bit_depth=bit_depth, peaks_ready=True)
+    return info
+
+
+# ----------------- librería en columnas -----------------
+SAMPLE_TYPE_IDS = {"": 0, "oneshot": 1, "loop": 2}
+
+
+class Library:
+    """
+    Vista columnar (SoA) de las muestras para filtrar y ordenar con máscaras NumPy
+    en vez de recorrer la lista de dicts. El índice i coincide con `samples[i]`.
+    """
+
+    def __init__(self, samples: list, favorites: set = ()):
+        self.n = 0
+        self.filenames, self.haystacks, self.tagsets = [], [], []
+        self.bpm = np.zeros(0, dtype=np.int32)
+        self.type_id = np.zeros(0, dtype=np.int8)
+        self.key_names = [""]
+        self._key_ids = {"": 0}
+        self.key_id = np.zeros(0, dtype=np.int16)
+        # rango alfabético del título normalizado; _title_order son los índices ya ordenados
+        self._titles, self._title_order = [], np.zeros(0, dtype=np.intp)
+        self.title_rank = np.zeros(0, dtype=np.int32)
+        self.fav = np.zeros(0, dtype=bool)
+        # índice invertido tag -> {i}; el de palabras del haystack se arma perezoso
+        self.tag_index = {}
+        # pares (muestra, tag) aplanados para contar tags visibles con un bincount
+        self.tag_names, self._tag_ids = [], {}
+        self._pair_tag = np.zeros(0, dtype=np.int32)
+        self._pair_owner = np.zeros(0, dtype=np.intp)
+        self.extend(samples, favorites)
+
+    def extend(self, samples: list, favorites: set = ()):
+        """
+        Agrega `samples` como índices n, n+1, ... sin volver a recorrer las que ya
+        estaban: durante el escaneo cada tanda cuesta lo que la tanda, no la biblioteca.
+        """
+        base, k = self.n, len(samples)
+        self.n += k
+        filenames = [s["filename"] for s in samples]
+        tagsets = [s["tagset"] for s in samples]
+        self.filenames += filenames
+        self.haystacks += [s["haystack"] for s in samples]
+        self.tagsets += tagsets
+        self.bpm = np.concatenate([self.bpm, np.fromiter(
+            (int(s.get("bpm") or 0) for s in samples), dtype=np.int32, count=k)])
+        self.type_id = np.concatenate([self.type_id, np.fromiter(
+            (SAMPLE_TYPE_IDS.get(s.get("sample_type") or "", 0) for s in samples), dtype=np.int8, count=k)])
+        key_ids = self._key_ids
+        for s in samples:
+            key = s.get("key") or ""
+            if key not in key_ids:
+                key_ids[key] = len(self.key_names)
+                self.key_names.append(key)
+        self.key_id = np.concatenate([self.key_id, np.fromiter(
+            (key_ids[s.get("key") or ""] for s in samples), dtype=np.int16, count=k)])
+        # sólo se ordena la tanda y se intercala con bisect en lo ya ordenado; con
+        # bisect_right los empates quedan por índice, igual que ordenando todo de nuevo
+        titles = self._titles
+        titles += [s.get("title_key") or strip_accents_lower(s["title"]) for s in samples]
+        new = sorted(range(base, self.n), key=titles.__getitem__)
+        at = [bisect.bisect_right(self._title_order, titles[i], key=titles.__getitem__) for i in new]
+        self._title_order = np.insert(self._title_order, at, new)
+        self.title_rank = np.empty(self.n, dtype=np.int32)
+        self.title_rank[self._title_order] = np.arange(self.n, dtype=np.int32)
+        self.fav = np.concatenate([self.fav, np.fromiter(
+            (f in favorites for f in filenames), dtype=bool, count=k)])
+
+        tag_ids, pair_tag = self._tag_ids, []
+        for i, tags in enumerate(tagsets, base):
+            for t in tags:
+                ids = self.tag_index.get(t)
+                if ids is None:
+                    ids = self.tag_index[t] = set()
+                    tag_ids[t] = len(self.tag_names)
+                    self.tag_names.append(t)
+                ids.add(i)
+                pair_tag.append(tag_ids[t])
+        self._pair_tag = np.concatenate([self._pair_tag, np.array(pair_tag, dtype=np.int32)])
+        self._pair_owner = np.concatenate([self._pair_owner, np.repeat(
+            np.arange(base, self.n, dtype=np.intp), [len(tags) for tags in tagsets])])
+        # las máscaras y el vocabulario tienen el largo anterior
+        self._vocab = None
+        self._tag_masks = {}    # tag -> máscara bool
+        self._token_hits = {}   # token de búsqueda -> (máscara de palabras, máscara de muestras)
+        # última (máscara, resultado) de order/tag_counts: una tecla que no cambia
+        # qué muestras se ven no vuelve a ordenar ni a contar
+        self._last_order = None
+        self._last_counts = None
+
+    def set_favorites(self, favorites: set):
+        self.fav[:] = [f in favorites for f in self.filenames]
+        self._last_order = None
+
+    def set_favorite(self, i: int, value: bool):
+        self.fav[i] = value
+        self._last_order = None
+
+    def mask(self, search_tokens=(), include_tags=(), exclude_tags=(), sample_type="",
+             keys=(), bpm_min=1, bpm_max=300, bpm_exact=0) -> np.ndarray:
+        m = np.ones(self.n, dtype=bool)
+        if sample_type:
+            m &= self.type_id == SAMPLE_TYPE_IDS.get(sample_type, -1)
+        if keys:
+            ids = [i for i, k in enumerate(self.key_names) if k and k in keys]
+            m &= np.isin(self.key_id, ids)
+        if bpm_exact:
+            m &= self.bpm == bpm_exact
+        else:
+            m &= (self.bpm == 0) | ((self.bpm >= bpm_min) & (self.bpm <= bpm_max))
+
+        for tag in include_tags:
+            m &= self.tag_mask(tag)
+        for tag in exclude_tags:
+            m &= ~self.tag_mask(tag)
+        for tok in search_tokens:
+            m &= self.token_mask(tok)
+        return m
+
+    def tag_counts(self, mask: np.ndarray, ignored=()) -> list:
+        """[(tag, n)] con la cantidad de muestras de `mask` que llevan cada tag (n > 0)."""
+        last = self._last_counts
+        if last is not None and np.array_equal(last[0], mask):
+            counts = last[1]
+        else:
+            counts = np.bincount(self._pair_tag[mask[self._pair_owner]], minlength=len(self.tag_names))
+            self._last_counts = (mask, counts)
+        names = self.tag_names
+        return [(names[j], int(counts[j])) for j in np.flatnonzero(counts) if names[j] not in ignored]
+
+    def _as_mask(self, ids) -> np.ndarray:
+        m = np.zeros(self.n, dtype=bool)
+        if ids:
+            m[np.fromiter(ids, dtype=np.intp, count=len(ids))] = True
+        return m
+
+    def tag_mask(self, tag: str) -> np.ndarray:
+        m = self._tag_masks.get(tag)
+        if m is None:
+            m = self._tag_masks[tag] = self._as_mask(self.tag_index.get(tag, ()))
+        return m
+
+    def token_mask(self, tok: str) -> np.ndarray:
+        """
+        Máscara de los haystacks que contienen `tok` (subcadena), memoizada. Un
+        token sin espacios está en el haystack sii está en alguna de sus palabras:
+        se recorre el vocabulario (mucho menor que las muestras) y las palabras que
+        matchean se expanden a muestras con las listas de muestras por palabra
+        (tipo CSR): un token selectivo cuesta lo que sus aciertos, no O(muestras). Al
+        extender un token ya resuelto ("dar" -> "dark") sólo se revisan sus palabras.
+        """
+        hit = self._token_hits.get(tok)
+        if hit is not None:
+            return hit[1]
+        if tok.split() != [tok]:
+            words = None
+            m = np.fromiter((tok in h for h in self.haystacks), dtype=bool, count=self.n)
+        else:
+            vocab = self._words()
+            parent = max((t for t, (w, _) in self._token_hits.items() if w is not None and t in tok),
+                         key=len, default=None)
+            cps = self._vocab_cps
+            parent_words = self._token_hits[parent][0] if parent is not None else None
+            cands = np.flatnonzero(parent_words) if parent is not None else None
+            words = np.zeros(len(vocab), dtype=bool)
+            if cands is not None and len(cands) * 40 < cps.size:
+                # padre selectivo: alcanza con revisar sus pocas palabras
+                words[cands[np.fromiter((tok in vocab[j] for j in cands), dtype=bool, count=len(cands))]] = True
+            else:
+                # el vocabulario unido por "\n" como code points: posiciones del primer
+                # carácter en bloque y se filtran por los siguientes. Sin un match de
+                # regex ni un `in` por palabra, la primera tecla (o extenderla, que
+                # sigue en casi todas las palabras) no paga Python por cada una. El
+                # token no tiene espacios: no puede cruzar de una palabra a otra
+                word_of = self._vocab_word_of
+                pos = np.flatnonzero(cps[:max(0, cps.size - len(tok) + 1)] == ord(tok[0]))
+                if parent_words is not None:
+                    pos = pos[parent_words[word_of[pos]]]
+                for k in range(1, len(tok)):
+                    pos = pos[cps[pos + k] == ord(tok[k])]
+                words[word_of[pos]] = True
+            m = np.zeros(self.n, dtype=bool)
+            m[self._postings(words)] = True
+        if len(self._token_hits) > 256:
+            self._token_hits.clear()
+        self._token_hits[tok] = (words, m)
+        return m
+
+    def _words(self) -> list:
+        """
+        Vocabulario de palabras de los haystacks y, por palabra, las muestras que la
+        contienen: las de la palabra j son _post_owner[_post_ptr[j]:_post_ptr[j + 1]].
+        """
+        if self._vocab is None:
+            # todo con map/NumPy: un bucle por palabra en Python era casi todo el costo
+            # de la primera tecla en bibliotecas grandes. Una sola lista de palabras
+            # (sin una lista viva por haystack, que además dispara el GC)
+            flat = " ".join(self.haystacks).split()
+            self._vocab = list(dict.fromkeys(flat))
+            ids = dict(zip(self._vocab, range(len(self._vocab))))
+            word_id = np.fromiter(map(ids.__getitem__, flat), dtype=np.intp, count=len(flat))
+            owner = np.repeat(np.arange(self.n, dtype=np.intp), list(map(len, map(str.split, self.haystacks))))
+            order = np.argsort(word_id, kind="stable")
+            word_id, owner = word_id[order], owner[order]
+            # una palabra repetida en el mismo haystack cuenta una sola vez
+            keep = np.ones(len(owner), dtype=bool)
+            keep[1:] = (word_id[1:] != word_id[:-1]) | (owner[1:] != owner[:-1])
+            self._post_owner = owner[keep]
+            # vocabulario unido por "\n" como code points y, por code point, su palabra
+            self._vocab_cps = np.frombuffer("\n".join(self._vocab).encode("utf-32-le", "surrogatepass"), dtype="<u4")
+            self._vocab_word_of = np.repeat(np.arange(len(self._vocab), dtype=np.int32),
+                                            [len(w) + 1 for w in self._vocab])[:self._vocab_cps.size]
+            self._post_ptr = np.zeros(len(self._vocab) + 1, dtype=np.intp)
+            np.cumsum(np.bincount(word_id[keep], minlength=len(self._vocab)), out=self._post_ptr[1:])
+        return self._vocab
+
+    def _postings(self, words: np.ndarray) -> np.ndarray:
+        """Muestras (con repetidos) de las palabras marcadas en `words`."""
+        ptr = self._post_ptr
+        wids = np.flatnonzero(words)
+        lens = ptr[wids + 1] - ptr[wids]
+        total = int(lens.sum())
+        if total * 4 >= len(self._post_owner):
+            # token poco selectivo: más barato expandir la máscara entera
+            return self._post_owner[np.repeat(words, np.diff(ptr))]
+        # índices de los tramos concatenados sin bucle de Python
+        starts = np.repeat(ptr[wids] - (np.cumsum(lens) - lens), lens)
+        return self._post_owner[starts + np.arange(total)]
+
+    def order(self, mask: np.ndarray) -> np.ndarray:
+        """Índices visibles: favoritos primero, luego alfabético por título (estable)."""
+        last = self._last_order
+        if last is not None and np.array_equal(last[0], mask):
+            return last[1]
+        idx = np.flatnonzero(mask)
+        order = idx[np.lexsort((self.title_rank[idx], ~self.fav[idx]))]
+        self._last_order = (mask, order)
+        return order
+
+
 # ----------------- UI: chips -----------------
-class TagChip(QtWidgets.QFrame):
+@functools.lru_cache(maxsize=None)
+def _pointing_cursor() -> QtGui.QCursor:
+    # un solo QCursor compartido por todos los widgets (requiere la QApplication)
+    return QtGui.QCursor(QtCore.Qt.PointingHandCursor)
+
+
+# tono -> (fondo, texto, borde); lo usan TagChip y el delegate de la lista
+CHIP_TONES = {
+    "blue": ("#0b2530", "#b3e4ff", "#123043"),
+    "indigo": ("#12183c", "#c7c9ff", "#1d226b"),
+    "green": ("#0f3d28", "#d4ffe3", "#1b5e3a"),
+    "violet": ("#351457", "#e7ccff", "#52227d"),
+    "gray": ("#232327", "#d1d5db", "#3a3a44"),
+}
+_CHIP_COLORS = {tone: tuple(QtGui.QColor(c) for c in cols) for tone, cols in CHIP_TONES.items()}
+# botones ＋/− que aparecen sobre un chip con hover (mismos colores que en TagChip)
+_CHIP_BUTTONS = (
+    ("＋", True, tuple(QtGui.QColor(c) for c in ("#14532d", "#ecfdf5", "#166534"))),
+    ("−", False, tuple(QtGui.QColor(c) for c in ("#7f1d1d", "#ffe4e6", "#991b1b"))),
+)
+
+
+def sample_chips(info: dict) -> list:
+    """[(texto, tono)] de los chips de una muestra, en el orden en que se muestran."""
+    chips = [(g, "blue") for g in info["genres"]]
+    chips += [(g, "indigo") for g in info["generals"]]
+    chips += [(t, "green") for t in info["specifics"]]
+    if info["key"]:
+        chips.append((info["key"], "violet"))
+    return chips
+
+
+def sample_meta_text(info: dict) -> str:
+    pieces = []
+    if info.get("sample_type"):
+        pieces.append(info["sample_type"])
+    if info.get("bpm"):
+        pieces.append(f'{info["bpm"]} BPM')
+    return " · ".join(pieces)
+
+
+class ChipsStrip(QtWidgets.QWidget):
+    """
+    Los chips de una fila pintados en un solo widget (con QStaticText) en vez de
+    un TagChip por tag. Mismo manejo: clic incluye, clic derecho excluye, y con
+    el mouse encima el chip muestra sus botones ＋/−.
+    """
     includeRequested = QtCore.Signal(str)
     excludeRequested = QtCore.Signal(str)
 
-    def __init__(self, text: str, tone: str, parent=None):
+    def __init__(self, chips, parent=None):
         super().__init__(parent)
-        self.raw_text = text
-        colors = {
-            "blue": "background:#0b2530;color:#b3e4ff;border:1px solid #123043;",
-            "indigo": "background:#12183c;color:#c7c9ff;border:1px solid #1d226b;",
-            "green": "background:#0f3d28;color:#d4ffe3;border:1px solid #1b5e3a;",
-            "violet": "background:#351457;color:#e7ccff;border:1px solid #52227d;",
-            "gray": "background:#232327;color:#d1d5db;border:1px solid #3a3a44;",
-        }[tone]
-        self.setStyleSheet(colors + " border-radius:10px;")
-        self.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
-        self.setSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
+        self._chips = chips
+        self._hover = -1
+        self.setMouseTracking(True)
+        self.setCursor(_pointing_cursor())
+        self.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        self._measure()
+
+    def _measure(self):
+        fm = QtGui.QFontMetricsF(self.font())
+        self._items = []
+        for text, tone in self._chips:
+            st = QtGui.QStaticText(text)
+            st.setTextFormat(QtCore.Qt.PlainText)
+            st.prepare(font=self.font())
+            self._items.append((text, _CHIP_COLORS[tone], st, int(fm.horizontalAdvance(text)) + 18))
+        self._chip_h = int(fm.height()) + 6
+        self._btn_w = int(fm.horizontalAdvance("＋")) + 8
+
+    def setChips(self, chips):
+        """Reutiliza el widget con otros chips."""
+        self._chips = chips
+        self._hover = -1
+        self._measure()
+        self.updateGeometry()
+        self.update()
 
-        lay = QtWidgets.QHBoxLayout(self)
-        lay.setContentsMargins(8, 2, 8, 2)
-        lay.setSpacing(6)
+    def _geometry(self):
+        """[(tag, colores, texto, rect del chip, [(rect, símbolo, incluye, colores)])]."""
+        out = []
+        x = 0.0
+        y = (self.height() - self._chip_h) / 2
+        for i, (text, colors, st, w) in enumerate(self._items):
+            buttons = []
+            if i == self._hover:
+                bx = x + w - 4
+                for sym, include, bcolors in _CHIP_BUTTONS:
+                    buttons.append((QtCore.QRectF(bx, y + 3, self._btn_w, self._chip_h - 6), sym, include, bcolors))
+                    bx += self._btn_w + 4
+                w = bx - x + 4
+            out.append((text, colors, st, QtCore.QRectF(x, y, w, self._chip_h), buttons))
+            x += w + 6
+        return out
+
+    def sizeHint(self):
+        if not self._items:
+            return QtCore.QSize(0, self._chip_h)
+        w = sum(it[3] for it in self._items) + 6 * (len(self._items) - 1)
+        if self._hover >= 0:
+            w += 2 * (self._btn_w + 4)
+        return QtCore.QSize(w, self._chip_h)
+
+    def changeEvent(self, e):
+        if e.type() == QtCore.QEvent.FontChange:
+            self._measure()
+            self.updateGeometry()
+        super().changeEvent(e)
 
-        self.lab = QtWidgets.QLabel(text)
-        self.lab.setStyleSheet("border:none;")
-        lay.addWidget(self.lab)
-
-        self.btnPlus = QtWidgets.QToolButton()
-        self.btnPlus.setText("＋")
-        self.btnPlus.setStyleSheet(
-            "QToolButton{background:#14532d;color:#ecfdf5;border:1px solid #166534;border-radius:6px;padding:0 4px;}"
-        )
-        self.btnPlus.setVisible(False)
-        self.btnPlus.clicked.connect(lambda: self.includeRequested.emit(self.raw_text))
-
-        self.btnMinus = QtWidgets.QToolButton()
-        self.btnMinus.setText("−")
-        self.btnMinus.setStyleSheet(
-            "QToolButton{background:#7f1d1d;color:#ffe4e6;border:1px solid #991b1b;border-radius:6px;padding:0 4px;}"
-        )
-        self.btnMinus.setVisible(False)
-        self.btnMinus.clicked.connect(lambda: self.excludeRequested.emit(self.raw_text))
-
-        lay.addWidget(self.btnPlus)
-        lay.addWidget(self.btnMinus)
+    def paintEvent(self, e):
+        p = QtGui.QPainter(self)
+        p.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        for text, (bg, fg, border), st, rect, buttons in self._geometry():
+            p.setPen(border)
+            p.setBrush(bg)
+            p.drawRoundedRect(rect.adjusted(0.5, 0.5, -0.5, -0.5), 10, 10)
+            p.setPen(fg)
+            p.drawStaticText(QtCore.QPointF(rect.x() + 9, rect.y() + (rect.height() - st.size().height()) / 2), st)
+            for brect, sym, _, (bbg, bfg, bborder) in buttons:
+                p.setPen(bborder)
+                p.setBrush(bbg)
+                p.drawRoundedRect(brect.adjusted(0.5, 0.5, -0.5, -0.5), 6, 6)
+                p.setPen(bfg)
+                p.drawText(brect, QtCore.Qt.AlignCenter, sym)
+
+    def _set_hover(self, i: int):
+        if i != self._hover:
+            self._hover = i
+            self.updateGeometry()
+            self.update()
 
-    def enterEvent(self, e):
-        self.btnPlus.setVisible(True)
-        self.btnMinus.setVisible(True)
-        super().enterEvent(e)
+    def mouseMoveEvent(self, e: QtGui.QMouseEvent):
+        pos = e.position()
+        hit = next((i for i, g in enumerate(self._geometry()) if g[3].contains(pos)), -1)
+        if hit >= 0 or not self.rect().contains(pos.toPoint()):
+            self._set_hover(hit)
+        super().mouseMoveEvent(e)
 
     def leaveEvent(self, e):
-        self.btnPlus.setVisible(False)
-        self.btnMinus.setVisible(False)
+        self._set_hover(-1)
         super().leaveEvent(e)
 
     def mousePressEvent(self, e: QtGui.QMouseEvent):
-        if e.button() == QtCore.Qt.RightButton:
-            self.excludeRequested.emit(self.raw_text)
-        else:
-            self.includeRequested.emit(self.raw_text)
-        e.accept()
+        pos = e.position()
+        for text, _, _, rect, buttons in self._geometry():
+            if not rect.contains(pos):
+                continue
+            include = e.button() != QtCore.Qt.RightButton
+            for brect, _, button_include, _ in buttons:
+                if brect.contains(pos):
+                    include = button_include
+            (self.includeRequested if include else self.excludeRequested).emit(text)
+            e.accept()
+            return
+        super().mousePressEvent(e)
+
+
+class TagChip(ChipsStrip):
+    """
+    Un chip suelto (sugeridos de TagRow) pintado como ChipsStrip: sin hoja de
+    estilo ni QLabel/QToolButton propios, así que crear o reciclar chips no
+    re-parsea QSS. Clic incluye, clic derecho excluye, ＋/− con el mouse encima.
+    """
+
+    def __init__(self, text: str, tone: str, parent=None):
+        self._tone = tone
+        self.raw_text = text
+        super().__init__([(text, tone)], parent)
+
+    def setText(self, text: str):
+        """Reutiliza el chip para otro tag (TagRow recicla sus chips)."""
+        self.raw_text = text
+        self.setChips([(text, self._tone)])
+
+
+# estilo de los chips de filtros activos: va en la hoja de MainWindow (se parsea una
+# vez) en vez de un setStyleSheet por chip
+SELECTED_CHIP_QSS = """
+QLabel#SelectedChip { background:#0f3d28; color:#d4ffe3; border:1px solid #1b5e3a; border-radius:10px; padding:2px 8px; }
+QLabel#SelectedChip[negate="true"] { background:#3b1111; color:#ffd4d4; border:1px solid #6b1f1f; }
+QToolButton#SelectedChipClose { color:#e5e7eb; }
+"""
 
 
 class SelectedChip(QtWidgets.QWidget):
@@ -358,16 +1412,13 @@ class SelectedChip(QtWidgets.QWidget):
         super().__init__(parent)
         self.tag = text
         lab = QtWidgets.QLabel(("NOT " if negate else "") + text)
-        lab.setStyleSheet(
-            ("background:#0f3d28;color:#d4ffe3;border:1px solid #1b5e3a;" if not negate
-             else "background:#3b1111;color:#ffd4d4;border:1px solid #6b1f1f;")
-            + " border-radius:10px; padding:2px 8px;"
-        )
+        lab.setObjectName("SelectedChip")
+        lab.setProperty("negate", bool(negate))
         btn = QtWidgets.QToolButton()
+        btn.setObjectName("SelectedChipClose")
         btn.setText("×")
-        btn.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        btn.setCursor(_pointing_cursor())
         btn.clicked.connect(lambda: self.removed.emit(self.tag))
-        btn.setStyleSheet("color:#e5e7eb;")
         lay = QtWidgets.QHBoxLayout(self)
         lay.setContentsMargins(0, 0, 0, 0)
         lay.setSpacing(6)
@@ -377,9 +1428,9 @@ class SelectedChip(QtWidgets.QWidget):
 
 # ----------------- drag button -----------------
 class DragButton(QtWidgets.QToolButton):
-    def __init__(self, get_path_callable, parent=None):
+    def __init__(self, get_url_callable, parent=None):
         super().__init__(parent)
-        self._get_path = get_path_callable
+        self._get_url = get_url_callable
         self.setText("⠿")
         self.setToolTip("Arrastra para soltar este audio en tu DAW")
         self.setCursor(QtGui.QCursor(QtCore.Qt.OpenHandCursor))
@@ -387,11 +1438,11 @@ class DragButton(QtWidgets.QToolButton):
 
     def mouseMoveEvent(self, e: QtGui.QMouseEvent):
         if e.buttons() & QtCore.Qt.LeftButton:
-            path = self._get_path()
-            if not path:
+            url = self._get_url()
+            if url is None:
                 return
             mime = QtCore.QMimeData()
-            mime.setUrls([QtCore.QUrl.fromLocalFile(str(path))])
+            mime.setUrls([url])
             drag = QtGui.QDrag(self)
             drag.setMimeData(mime)
             drag.exec(QtCore.Qt.CopyAction)
@@ -401,48 +1452,119 @@ class DragButton(QtWidgets.QToolButton):
 
 # ----------------- WaveWidget / PlayerPopover -----------------
 class WaveWidget(QtWidgets.QWidget):
+    BAR_PITCH = 3  # px por barra: la cantidad de barras sigue al ancho, no al largo del audio
+
     def __init__(self, peaks=None, parent=None):
         super().__init__(parent)
-        self._peaks = peaks or []
+        self._peaks = None
+        self._src = None         # picos tal como llegaron: el mismo array no rehace nada
         self._progress = 0.0
+        self._rects = None       # geometría de barras cacheada (depende de picos + tamaño)
+        self._rects_size = None
+        self._pix = None         # (tamaño, dpr, x de cada barra, pixmap "sonado", pixmap "resto")
         self.setMinimumHeight(54)
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
         self.setStyleSheet("background: transparent;")
         self.setSizePolicy(QtWidgets.QSizePolicy.MinimumExpanding, QtWidgets.QSizePolicy.Fixed)
+        self.setPeaks(peaks)
 
     def setPeaks(self, peaks):
-        self._peaks = peaks or []
+        if peaks is self._src:
+            return  # replay de la misma muestra: barras y pixmaps siguen valiendo
+        self._src = peaks
+        self._peaks = np.asarray(peaks, dtype=np.float32) if peaks is not None and len(peaks) else None
+        self._rects = None
+        self._pix = None
         self.update()
 
     def setProgress(self, p):
-        self._progress = max(0.0, min(1.0, p))
-        self.update()
+        p = max(0.0, min(1.0, p))
+        if p == self._progress:
+            return
+        old, self._progress = self._progress, p
+        if self._pix is None or self._pix[0] != self.size():
+            self.update()
+            return
+        # sólo cambia la franja entre el corte anterior y el nuevo; si el corte no
+        # pasó a otra barra no hay nada que repintar (ni el popover con su sombra)
+        a, b = self._split_x(old), self._split_x(p)
+        if a != b:
+            self.update(min(a, b), 0, abs(b - a), self.height())
+
+    def _split_x(self, progress: float) -> int:
+        """x donde termina lo sonado: el inicio de la primera barra sin sonar."""
+        xs = self._pix[2]
+        cutoff = int(len(xs) * progress)
+        return xs[cutoff] if cutoff < len(xs) else self.width()
+
+    def _resampled_peaks(self, bars: int) -> np.ndarray:
+        src = self._peaks
+        if src is None:
+            return np.full(bars, 0.35)
+        if src.size == bars:
+            return src.astype(np.float64)
+        if src.size > bars:
+            # más picos que barras: cada barra toma el máximo de su tramo (interpolar
+            # puntos sueltos se salteaba los transitorios entre uno y otro)
+            edges = np.arange(bars) * src.size // bars
+            return np.maximum.reduceat(src, edges).astype(np.float64)
+        return np.interp(np.linspace(0, src.size - 1, bars), np.arange(src.size), src)
+
+    def _bar_rects(self):
+        size = self.size()
+        if self._rects is not None and self._rects_size == size:
+            return self._rects
+        w = max(1, size.width())
+        h = size.height()
+        mid = (h - 1) // 2  # == QRect.center().y()
+        bars = max(1, w // self.BAR_PITCH)
+        bar_w = max(1, int(max(1, int(w / bars)) * 0.85))
+        # alturas/posiciones en NumPy; sólo la construcción de QRect queda en Python
+        hs = np.maximum(1, (self._resampled_peaks(bars) * h * 0.92).astype(np.int32))
+        xs = (np.arange(bars) * (w / bars)).astype(np.int32)
+        ys = (mid - hs / 2).astype(np.int32)
+        QRect = QtCore.QRect
+        rects = [QRect(x, y, bar_w, bh) for x, y, bh in zip(xs.tolist(), ys.tolist(), hs.tolist())]
+        self._rects = rects
+        self._rects_size = size
+        return rects
+
+    def _bar_pixmaps(self):
+        """
+        Las barras pintadas una vez en dos colores (sonado / resto). Cambiar el
+        progreso (decenas de veces por segundo) queda en dos blits partidos en la
+        x de la primera barra sin sonar.
+        """
+        size = self.size()
+        dpr = self.devicePixelRatioF()
+        if self._pix is not None and self._pix[0] == size and self._pix[1] == dpr:
+            return self._pix
+        rects = self._bar_rects()
+        pms = []
+        for brush in (_WAVE_PLAYED, _WAVE_REMAIN):
+            pm = QtGui.QPixmap(max(1, round(size.width() * dpr)), max(1, round(size.height() * dpr)))
+            pm.setDevicePixelRatio(dpr)
+            pm.fill(QtCore.Qt.transparent)
+            p = QtGui.QPainter(pm)
+            p.setRenderHint(QtGui.QPainter.Antialiasing, False)
+            p.setPen(QtCore.Qt.NoPen)
+            p.setBrush(brush)
+            p.drawRects(rects)
+            p.end()
+            pms.append(pm)
+        self._pix = (size, dpr, [r.x() for r in rects], *pms)
+        return self._pix
 
     def paintEvent(self, e):
+        _, dpr, xs, played, remain = self._bar_pixmaps()
+        w, h = self.width(), self.height()
+        split = self._split_x(self._progress)
         p = QtGui.QPainter(self)
-        p.setRenderHint(QtGui.QPainter.Antialiasing, False)
-        r = self.rect()
-        mid = r.center().y()
-        w = max(1, r.width())
-        h = r.height()
-        bars = max(1, len(self._peaks) or 120)
-        barW = max(1, int(w / bars))
-        cutoff = int(bars * self._progress)
-        p.setPen(QtCore.Qt.NoPen)
-
-        p.setBrush(QtGui.QColor("#e5e7eb"))
-        for i in range(min(cutoff, bars)):
-            pk = self._peaks[i] if (self._peaks and i < len(self._peaks)) else 0.35
-            bh = max(1, int(pk * h * 0.92))
-            y = int(mid - bh / 2)
-            p.drawRect(QtCore.QRect(int(i * (w / bars)), y, max(1, int(barW * 0.85)), bh))
-
-        p.setBrush(QtGui.QColor("#a1a1aa"))
-        for i in range(cutoff, bars):
-            pk = self._peaks[i] if (self._peaks and i < len(self._peaks)) else 0.35
-            bh = max(1, int(pk * h * 0.92))
-            y = int(mid - bh / 2)
-            p.drawRect(QtCore.QRect(int(i * (w / bars)), y, max(1, int(barW * 0.85)), bh))
+        if split > 0:
+            p.drawPixmap(QtCore.QRectF(0, 0, split, h), played, QtCore.QRectF(0, 0, split * dpr, h * dpr))
+        if split < w:
+            p.drawPixmap(QtCore.QRectF(split, 0, w - split, h), remain,
+                         QtCore.QRectF(split * dpr, 0, (w - split) * dpr, h * dpr))
 
 
 class PlayerPopover(QtWidgets.QFrame):
@@ -824,8 +1946,80 @@ class TypeFilterPopover(AnchorPopover):
             self.hide()
 
 
+# ----------------- picos de onda en segundo plano -----------------
+class LibraryScanJob(QtCore.QRunnable):
+    """
+    Recorre y parsea la carpeta fuera del hilo UI. Los `info` vuelven por tandas
+    (cada BATCH muestras o cada INTERVAL s) para que la lista se llene mientras
+    tanto. `gen` identifica el escaneo: la UI descarta tandas de uno viejo, y
+    `cancel()` lo corta (cambio de carpeta, cierre).
+    """
+    BATCH = 64
+    INTERVAL = 0.1
+
+    class Signals(QtCore.QObject):
+        batch = QtCore.Signal(int, object)  # (gen, [info])
+        finished = QtCore.Signal(int)
+
+    def __init__(self, root: Path, gen: int, signals: "LibraryScanJob.Signals"):
+        super().__init__()
+        self.root = root
+        self.gen = gen
+        self.signals = signals
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        pending = []
+        last = time.monotonic()
+        try:
+            for res in scan_library(self.root, collect_audio_files(self.root)):
+                if self._cancelled.is_set():
+                    return
+                pending.append(sample_info(res))
+                now = time.monotonic()
+                if len(pending) >= self.BATCH or now - last >= self.INTERVAL:
+                    self.signals.batch.emit(self.gen, pending)
+                    pending = []
+                    last = now
+            if pending:
+                self.signals.batch.emit(self.gen, pending)
+        finally:
+            self.signals.finished.emit(self.gen)
+
+
+class PeaksJob(QtCore.QRunnable):
+    """Calcula los picos de un WAV fuera del hilo UI; el resultado vuelve por señal."""
+
+    class Signals(QtCore.QObject):
+        done = QtCore.Signal(str, object, float, int, int)  # (ruta, picos, duración s, rate, bits)
+
+    def __init__(self, path: Path, signals: "PeaksJob.Signals"):
+        super().__init__()
+        self.path = path
+        self.signals = signals
+
+    def run(self):
+        peaks, duration, sample_rate, bit_depth = read_pcm_waveform_cached(self.path)
+        self.signals.done.emit(str(self.path), peaks, float(duration), int(sample_rate), int(bit_depth))
+
+
 # ----------------- AUDIO EN HILO DEDICADO -----------------
 class PlayerWorker(QtCore.QObject):
+    """
+    Pool fijo de 2 QMediaPlayer (activo + precarga), cada uno con su QAudioOutput.
+    Se reutilizan con setSource en vez de recrearlos en cada play; el que no suena
+    puede quedar con el siguiente sample ya cargado (prefetch_path).
+    Los WAV de hasta SHORT_WAV_BYTES van por QSoundEffect (LRU de EFFECTS_MAX);
+    como no informa posición, se emula con un reloj propio.
+    """
+    POOL_SIZE = 2
+    SHORT_WAV_BYTES = 1 << 20  # ~6 s de estéreo 16 bit / 44.1 kHz
+    EFFECTS_MAX = 8
+    EFFECT_TICK_MS = 30
+
     # señales hacia UI
     positionChanged = QtCore.Signal(int)
     stateChanged = QtCore.Signal(int)
@@ -837,44 +2031,144 @@ class PlayerWorker(QtCore.QObject):
     @QtCore.Slot()
     def init(self):
         # Crear backend dentro del hilo
+        self._players = []
+        self._outputs = []
+        self._sources = []
+        self._active = 0
         try:
-            self.audio_out = QtMultimedia.QAudioOutput()
-            self.audio_out.setVolume(0.9)
-            self.player = QtMultimedia.QMediaPlayer()
-            self.player.setAudioOutput(self.audio_out)
-
-            # Foward signals (salen cruzando hilos como queued)
-            self.player.positionChanged.connect(lambda ms: self.positionChanged.emit(int(ms)))
-            self.player.playbackStateChanged.connect(lambda st: self.stateChanged.emit(int(st)))
-            self.player.mediaStatusChanged.connect(lambda st: self.statusChanged.emit(int(st)))
+            for _ in range(self.POOL_SIZE):
+                out = QtMultimedia.QAudioOutput()
+                out.setVolume(0.9)
+                player = QtMultimedia.QMediaPlayer()
+                player.setAudioOutput(out)
+
+                # Foward signals (salen cruzando hilos como queued), sólo del player activo
+                player.positionChanged.connect(
+                    lambda ms, p=player: p is self.player and self.positionChanged.emit(int(ms)))
+                player.playbackStateChanged.connect(
+                    lambda st, p=player: p is self.player and self.stateChanged.emit(int(st)))
+                player.mediaStatusChanged.connect(
+                    lambda st, p=player: p is self.player and self.statusChanged.emit(int(st)))
+                self._players.append(player)
+                self._outputs.append(out)
+                self._sources.append("")
+            self.player = self._players[0]
+            self.audio_out = self._outputs[0]
         except Exception as e:
             self.errorOccurred.emit(f"init: {e!r}")
 
         self._current = ""
+        self._volume = 0.9
+        self._short_wav = {}  # ruta -> va por QSoundEffect (ver _is_short_wav)
+        self._effects = {}    # ruta -> QSoundEffect (orden LRU: el último es el más reciente)
+        self._effect = None   # el que corresponde a la muestra actual, si va por QSoundEffect
+        self._effect_stopping = False
+        self._effect_clock = QtCore.QElapsedTimer()
+        self._effect_tick = QtCore.QTimer(self)
+        self._effect_tick.setInterval(self.EFFECT_TICK_MS)
+        self._effect_tick.timeout.connect(
+            lambda: self.positionChanged.emit(int(self._effect_clock.elapsed())))
+
+    def _is_short_wav(self, path_str: str) -> bool:
+        # memoizado por ruta: la precarga de la fila siguiente ya lo resuelve y el
+        # play no hace un stat (en discos de red cada uno se nota)
+        hit = self._short_wav.get(path_str)
+        if hit is None:
+            try:
+                hit = (path_str.lower().endswith(".wav")
+                       and os.path.getsize(path_str) <= self.SHORT_WAV_BYTES)
+            except OSError:
+                return False
+            self._short_wav[path_str] = hit
+        return hit
+
+    def _get_effect(self, path_str: str):
+        """QSoundEffect de `path_str` (lo crea y empieza a cargar si no estaba)."""
+        eff = self._effects.pop(path_str, None)
+        if eff is None:
+            eff = QtMultimedia.QSoundEffect()
+            eff.setVolume(self._volume)
+            eff.playingChanged.connect(lambda e=eff: self._on_effect_playing(e))
+            eff.statusChanged.connect(lambda e=eff: self._on_effect_status(e))
+            eff.setSource(QtCore.QUrl.fromLocalFile(path_str))
+        self._effects[path_str] = eff
+        for old_path in list(self._effects)[:max(0, len(self._effects) - self.EFFECTS_MAX)]:
+            if self._effects[old_path] is not self._effect:  # el que suena no se descarta
+                self._effects.pop(old_path).deleteLater()
+        return eff
+
+    def _stop_effect(self):
+        eff, self._effect = self._effect, None
+        self._effect_tick.stop()
+        if eff is not None and eff.isPlaying():
+            self._effect_stopping = True
+            eff.stop()
+            self._effect_stopping = False
+
+    def _on_effect_playing(self, eff):
+        if eff is not self._effect:
+            return
+        if eff.isPlaying():
+            self._effect_clock.start()
+            self._effect_tick.start()
+            self.stateChanged.emit(int(QtMultimedia.QMediaPlayer.PlayingState))
+        elif not self._effect_stopping:
+            # terminó solo: mismo aviso que da QMediaPlayer al llegar al final
+            self._effect_tick.stop()
+            self.stateChanged.emit(int(QtMultimedia.QMediaPlayer.StoppedState))
+            self.statusChanged.emit(int(QtMultimedia.QMediaPlayer.EndOfMedia))
+
+    def _on_effect_status(self, eff):
+        if eff.status() != QtMultimedia.QSoundEffect.Error:
+            return
+        # formato que QSoundEffect no entiende (p.ej. WAV float): sale del LRU y, si
+        # era el que debía sonar, se prueba con QMediaPlayer
+        for path_str, e in list(self._effects.items()):
+            if e is eff:
+                del self._effects[path_str]
+        eff.deleteLater()
+        if eff is self._effect:
+            self._effect = None
+            self._play_media(self._current)
+
+    def _activate(self, idx: int):
+        old = self.player
+        self._active = idx
+        self.player = self._players[idx]
+        self.audio_out = self._outputs[idx]
+        if old is not self.player:
+            old.stop()
 
     @QtCore.Slot(str)
     def play_path(self, path_str: str):
-        try:
-            url = QtCore.QUrl.fromLocalFile(path_str)
-            # Hard switch: parar/descargar y, por robustez, recrear player
+        self._stop_effect()
+        if self._is_short_wav(path_str):
             try:
+                eff = self._get_effect(path_str)
+                if eff.status() != QtMultimedia.QSoundEffect.Error:
+                    self.player.stop()
+                    self._effect = eff
+                    self._current = path_str
+                    self.currentSourceChanged.emit(self._current)
+                    eff.play()  # si todavía carga, arranca al terminar
+                    return
+                self._on_effect_status(eff)  # ya falló antes: fuera del LRU
+            except Exception as e:
+                self.errorOccurred.emit(f"play_path: {e!r}")
+        self._play_media(path_str)
+
+    def _play_media(self, path_str: str):
+        try:
+            idle = (self._active + 1) % len(self._players)
+            if self._sources[idle] == path_str:
+                # ya precargado en el otro slot → sólo cambiar de player
+                self._activate(idle)
+            else:
                 self.player.stop()
-                self.player.setSource(QtCore.QUrl())
-            except Exception:
-                pass
-
-            # recrear player para evitar estados raros del backend
-            try:
-                self.player.deleteLater()
-            except Exception:
-                pass
-            self.player = QtMultimedia.QMediaPlayer()
-            self.player.setAudioOutput(self.audio_out)
-            self.player.positionChanged.connect(lambda ms: self.positionChanged.emit(int(ms)))
-            self.player.playbackStateChanged.connect(lambda st: self.stateChanged.emit(int(st)))
-            self.player.mediaStatusChanged.connect(lambda st: self.statusChanged.emit(int(st)))
+                if self._sources[self._active] != path_str:
+                    self.player.setSource(QtCore.QUrl.fromLocalFile(path_str))
+                    self._sources[self._active] = path_str
 
-            self.player.setSource(url)
             self.player.setPosition(0)
             self.player.play()
             self._current = path_str
@@ -882,8 +2176,35 @@ class PlayerWorker(QtCore.QObject):
         except Exception as e:
             self.errorOccurred.emit(f"play_path: {e!r}")
 
+    @QtCore.Slot(str)
+    def prefetch_path(self, path_str: str):
+        """Carga `path_str` en el player inactivo sin reproducirlo."""
+        try:
+            if self._is_short_wav(path_str):
+                self._get_effect(path_str)  # queda cargado en el LRU
+                return
+            idle = (self._active + 1) % len(self._players)
+            if not path_str or path_str in (self._sources[idle], self._current):
+                return
+            self._players[idle].setSource(QtCore.QUrl.fromLocalFile(path_str))
+            self._sources[idle] = path_str
+        except Exception as e:
+            self.errorOccurred.emit(f"prefetch_path: {e!r}")
+
     @QtCore.Slot()
     def toggle_pause(self):
+        eff = self._effect
+        if eff is not None:
+            # QSoundEffect no pausa: se corta y al reanudar vuelve a empezar
+            if eff.isPlaying():
+                self._effect_tick.stop()
+                self._effect_stopping = True
+                eff.stop()
+                self._effect_stopping = False
+                self.stateChanged.emit(int(QtMultimedia.QMediaPlayer.PausedState))
+            else:
+                eff.play()
+            return
         try:
             if self.player.playbackState() == QtMultimedia.QMediaPlayer.PlayingState:
                 self.player.pause()
@@ -894,18 +2215,25 @@ class PlayerWorker(QtCore.QObject):
 
     @QtCore.Slot()
     def stop_all(self):
+        self._stop_effect()
         try:
             self._current = ""
             self.currentSourceChanged.emit("")
-            self.player.stop()
-            self.player.setSource(QtCore.QUrl())
+            for i, player in enumerate(self._players):
+                player.stop()
+                player.setSource(QtCore.QUrl())
+                self._sources[i] = ""
         except Exception:
             pass
 
     @QtCore.Slot(float)
     def set_volume(self, v: float):
+        self._volume = max(0.0, min(1.0, v))
         try:
-            self.audio_out.setVolume(max(0.0, min(1.0, v)))
+            for out in self._outputs:
+                out.setVolume(self._volume)
+            for eff in self._effects.values():
+                eff.setVolume(self._volume)
         except Exception:
             pass
 
@@ -913,7 +2241,11 @@ class PlayerWorker(QtCore.QObject):
     def shutdown(self):
         try:
             self.stop_all()
-            self.player.deleteLater()
+            for player in self._players:
+                player.deleteLater()
+            for eff in self._effects.values():
+                eff.deleteLater()
+            self._effects.clear()
         except Exception:
             pass
 
@@ -923,9 +2255,20 @@ class AudioBridge(QtCore.QObject):
     requestToggle = QtCore.Signal()
     requestStop = QtCore.Signal()
     requestVolume = QtCore.Signal(float)
+    requestPrefetch = QtCore.Signal(str)
 
 
 # ----------------- fila -----------------
+# va en la hoja de MainWindow (se parsea una vez); la fila sólo cambia su propiedad "playing"
+SAMPLE_ROW_QSS = """
+#SampleRow { background:#19191d; border:1px solid #303039; border-radius:12px; }
+#SampleRow[playing="true"] { background: rgba(37,99,235,0.18); border:1px solid #3b82f6; }
+#SampleRowBody, #SampleRowBody * { background:transparent; }
+QLabel#SampleRowTitle { color:#e5e7eb; }
+QLabel#SampleRowMeta { color:#9ca3af; }
+"""
+
+
 class SampleRow(QtWidgets.QFrame):
     playClicked = QtCore.Signal(object)
     starToggled = QtCore.Signal(object)
@@ -941,69 +2284,40 @@ class SampleRow(QtWidgets.QFrame):
         self._apply_style()
 
         # Drag
-        self.btnDrag = DragButton(lambda: self.info["path"])
+        self.btnDrag = DragButton(lambda: QtCore.QUrl.fromLocalFile(self.info["path_str"]))
         self.btnDrag.setFixedWidth(40)
 
         # Play
         self.btnPlay = QtWidgets.QPushButton("▶")
         self.btnPlay.setFixedWidth(40)
         self.btnPlay.clicked.connect(lambda: self.playClicked.emit(self))
-        self.btnPlay.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.btnPlay.setCursor(_pointing_cursor())
 
         # Cover art
         self.cover = QtWidgets.QLabel()
         self.cover.setFixedSize(40, 40)
-        pm = load_cover_pixmap(info["path"]) or placeholder_pixmap(info["path"].suffix, 40)
-        self.cover.setPixmap(pm.scaled(40, 40, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation))
+        self.cover.setPixmap(cover_pixmap(info, 40))
         self.cover.setToolTip("Carátula/cover art (si existe)")
 
-        # Chips (género/general/específicos/key)
-        chipsL = QtWidgets.QHBoxLayout()
-        chipsL.setContentsMargins(0, 0, 0, 0)
-        chipsL.setSpacing(6)
-        for g in info["genres"]:
-            c = TagChip(g, "blue")
-            c.includeRequested.connect(self.tagInclude)
-            c.excludeRequested.connect(self.tagExclude)
-            chipsL.addWidget(c)
-        for g in info["generals"]:
-            c = TagChip(g, "indigo")
-            c.includeRequested.connect(self.tagInclude)
-            c.excludeRequested.connect(self.tagExclude)
-            chipsL.addWidget(c)
-        for s in info["specifics"]:
-            c = TagChip(s, "green")
-            c.includeRequested.connect(self.tagInclude)
-            c.excludeRequested.connect(self.tagExclude)
-            chipsL.addWidget(c)
-        if info["key"]:
-            ck = TagChip(info["key"], "violet")
-            ck.includeRequested.connect(self.tagInclude)
-            ck.excludeRequested.connect(self.tagExclude)
-            chipsL.addWidget(ck)
-
-        chipsW = QtWidgets.QWidget()
-        chipsW.setStyleSheet("background:transparent;")
-        ch = QtWidgets.QHBoxLayout(chipsW)
-        ch.setContentsMargins(0, 0, 0, 0)
-        ch.setSpacing(6)
-        ch.addLayout(chipsL)
-        ch.addStretch(1)
+        # Chips (género/general/específicos/key), pintados en un solo widget
+        self.chipsW = ChipsStrip(sample_chips(info))
+        self.chipsW.includeRequested.connect(self.tagInclude)
+        self.chipsW.excludeRequested.connect(self.tagExclude)
 
         # Título + metadatos
         self.nameLbl = QtWidgets.QLabel(info["title"])
-        self.nameLbl.setStyleSheet("color:#e5e7eb;")
+        self.nameLbl.setObjectName("SampleRowTitle")
         self.nameLbl.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
-        self.nameLbl.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.nameLbl.setCursor(_pointing_cursor())
         self.nameLbl.mousePressEvent = lambda e: (self.playClicked.emit(self), e.accept())
 
         self.metaLbl = QtWidgets.QLabel(self._meta_text())
-        self.metaLbl.setStyleSheet("color:#9ca3af;")
+        self.metaLbl.setObjectName("SampleRowMeta")
         self.metaLbl.setAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
 
         # Estrella
         self.btnStar = QtWidgets.QToolButton()
-        self.btnStar.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.btnStar.setCursor(_pointing_cursor())
         self._sync_star_icon()
         self.btnStar.clicked.connect(self._toggle_star)
         self._update_star_visibility(show_hover=False)
@@ -1011,14 +2325,14 @@ class SampleRow(QtWidgets.QFrame):
         left = QtWidgets.QHBoxLayout()
         left.setContentsMargins(0, 0, 0, 0)
         left.setSpacing(8)
-        left.addWidget(chipsW)
+        left.addWidget(self.chipsW)
         left.addWidget(self.nameLbl, 1)
         left.addWidget(self.metaLbl, 0)
         left.addWidget(self.btnStar)
         leftW = QtWidgets.QWidget()
-        leftW.setStyleSheet("background:transparent;")
+        leftW.setObjectName("SampleRowBody")
         leftW.setLayout(left)
-        leftW.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        leftW.setCursor(_pointing_cursor())
         leftW.mousePressEvent = lambda e: (self.playClicked.emit(self), e.accept())
 
         grid = QtWidgets.QGridLayout(self)
@@ -1033,13 +2347,20 @@ class SampleRow(QtWidgets.QFrame):
 
         self.setMouseTracking(True)
 
+    def setInfo(self, info, is_fav: bool):
+        """Reutiliza la fila para otra muestra (la lista recicla sus SampleRow)."""
+        self.info = info
+        self.isFav = is_fav
+        self.cover.setPixmap(cover_pixmap(info, 40))
+        self.chipsW.setChips(sample_chips(info))
+        self.nameLbl.setText(info["title"])
+        self.metaLbl.setText(self._meta_text())
+        self._sync_star_icon()
+        self._update_star_visibility(show_hover=False)
+        self.setPlaying(False)
+
     def _meta_text(self):
-        pieces = []
-        if self.info.get("sample_type"):
-            pieces.append(self.info["sample_type"])
-        if self.info.get("bpm"):
-            pieces.append(f'{self.info["bpm"]} BPM')
-        return " · ".join(pieces)
+        return sample_meta_text(self.info)
 
     def anchor_widget(self) -> QtWidgets.QWidget:
         return self.btnPlay
@@ -1053,10 +2374,12 @@ class SampleRow(QtWidgets.QFrame):
         super().leaveEvent(e)
 
     def _apply_style(self):
-        if self.isPlaying:
-            self.setStyleSheet("#SampleRow { background: rgba(37,99,235,0.18); border:1px solid #3b82f6; border-radius:12px; }")
-        else:
-            self.setStyleSheet("#SampleRow { background:#19191d; border:1px solid #303039; border-radius:12px; }")
+        if self.property("playing") == self.isPlaying:
+            return
+        self.setProperty("playing", self.isPlaying)
+        st = self.style()
+        st.unpolish(self)
+        st.polish(self)
 
     def _sync_star_icon(self):
         self.btnStar.setText("★" if self.isFav else "☆")
@@ -1080,6 +2403,247 @@ class SampleRow(QtWidgets.QFrame):
         self._apply_style()
 
 
+# ----------------- lista virtual (modelo + delegate) -----------------
+_ROW_BG = QtGui.QColor("#19191d")
+_ROW_BORDER = QtGui.QColor("#303039")
+_TITLE_FG = QtGui.QColor("#e5e7eb")
+_META_FG = QtGui.QColor("#9ca3af")
+
+
+class SampleModel(QtCore.QAbstractListModel):
+    """
+    Modelo de la lista: `samples` (todas las muestras) y `order`, los índices
+    visibles ya filtrados y ordenados por Library. La fila r es samples[order[r]].
+    """
+    InfoRole = QtCore.Qt.UserRole + 1
+    MAX_RUNS = 32  # más tramos que esto → un reset sale más barato
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.samples = []
+        self.order = np.zeros(0, dtype=np.intp)
+        self.pos_of = np.zeros(0, dtype=np.intp)  # índice de muestra -> fila (-1 = oculta)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        info = self.samples[self.order[index.row()]]
+        if role == self.InfoRole:
+            return info
+        if role == QtCore.Qt.DisplayRole:
+            return info["title"]
+        return None
+
+    def setSamples(self, samples: list, order=()):
+        """Carga una librería nueva con su orden inicial en un único reset."""
+        self.beginResetModel()
+        self.samples = samples
+        self.order = np.asarray(order, dtype=np.intp)
+        self.pos_of = np.full(len(samples), -1, dtype=np.intp)
+        self.pos_of[self.order] = np.arange(len(self.order))
+        self.endResetModel()
+
+    def setOrder(self, order) -> bool:
+        """Reemplaza el orden visible. Devuelve False (sin reset) si no cambió."""
+        order = np.asarray(order, dtype=np.intp)
+        if np.array_equal(order, self.order) and len(self.pos_of) == len(self.samples):
+            return False
+        pos_of = np.full(len(self.samples), -1, dtype=np.intp)
+        pos_of[order] = np.arange(len(order))
+        if not self._apply_runs(order, pos_of):
+            self.beginResetModel()
+            self.order = order
+            self.endResetModel()
+        self.pos_of = pos_of
+        return True
+
+    @staticmethod
+    def _runs(rows: np.ndarray) -> list:
+        """Filas ordenadas -> tramos contiguos [(primera, última)]."""
+        if not len(rows):
+            return []
+        cut = np.flatnonzero(np.diff(rows) != 1) + 1
+        return [(int(r[0]), int(r[-1])) for r in np.split(rows, cut)]
+
+    def _apply_runs(self, order: np.ndarray, pos_of: np.ndarray) -> bool:
+        """
+        Si el orden nuevo sólo agrega filas (escaneo en curso) o sólo quita filas
+        (un filtro más estricto) sin reordenar las que quedan, lo aplica con
+        insert/removeRows por tramos: la vista conserva scroll e index widgets.
+        """
+        old = self.order
+        if len(self.pos_of) != len(self.samples):
+            # llegaron muestras nuevas: las viejas conservan su índice
+            old_pos = np.full(len(self.samples), -1, dtype=np.intp)
+            old_pos[old] = np.arange(len(old))
+        else:
+            old_pos = self.pos_of
+        parent = QtCore.QModelIndex()
+        if len(order) > len(old):
+            at = pos_of[old]
+            if (at < 0).any() or (np.diff(at) <= 0).any():
+                return False
+            keep = np.zeros(len(order), dtype=bool)
+            keep[at] = True
+            runs = self._runs(np.flatnonzero(~keep))
+            if len(runs) > self.MAX_RUNS:
+                return False
+            for first, last in runs:  # de arriba abajo: lo anterior ya es definitivo
+                self.beginInsertRows(parent, first, last)
+                self.order = np.concatenate((order[:last + 1], self.order[first:]))
+                self.endInsertRows()
+            return True
+        if len(order) < len(old):
+            at = old_pos[order]
+            if (at < 0).any() or (np.diff(at) <= 0).any():
+                return False
+            keep = np.zeros(len(old), dtype=bool)
+            keep[at] = True
+            runs = self._runs(np.flatnonzero(~keep))
+            if len(runs) > self.MAX_RUNS:
+                return False
+            for first, last in reversed(runs):  # de abajo arriba: los índices de arriba no se mueven
+                self.beginRemoveRows(parent, first, last)
+                self.order = np.concatenate((self.order[:first], self.order[last + 1:]))
+                self.endRemoveRows()
+            return True
+        return False
+
+    def index_of(self, sample_idx: int) -> QtCore.QModelIndex:
+        pos = int(self.pos_of[sample_idx]) if 0 <= sample_idx < len(self.pos_of) else -1
+        return self.index(pos, 0) if pos >= 0 else QtCore.QModelIndex()
+
+
+class SampleDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Pinta cada fila con el mismo aspecto que SampleRow, sin crear widgets. Los
+    botones (drag/play/estrella) son capturas de widgets reales hechas una vez.
+    Un SampleRow de verdad sólo existe para la fila bajo el mouse y la que suena.
+    """
+    ROW_HEIGHT = 62
+    rowReleased = QtCore.Signal(object)  # SampleRow que la vista soltó, para reciclar
+
+    def __init__(self, favorites: set, view: QtWidgets.QListView):
+        super().__init__(view)
+        self._view = view
+        self._favorites = favorites
+        self._stamps = {}
+
+    def sizeHint(self, option, index):
+        return QtCore.QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def destroyEditor(self, editor, index):
+        # la vista suelta sus index widgets por acá (reset, filas quitadas,
+        # closePersistentEditor): los SampleRow se guardan en vez de destruirse
+        if isinstance(editor, SampleRow):
+            self.rowReleased.emit(editor)
+        else:
+            super().destroyEditor(editor, index)
+
+    def _stamp(self, kind: str) -> QtGui.QPixmap:
+        pm = self._stamps.get(kind)
+        if pm is None:
+            host = self._view.viewport()
+            if kind == "drag":
+                w = DragButton(lambda: None, host)
+                w.setFixedSize(40, 19)
+            elif kind == "star":
+                w = QtWidgets.QToolButton(host)
+                w.setText("★")
+            else:
+                w = QtWidgets.QPushButton(kind, host)
+                w.setFixedSize(40, 22)
+            w.hide()
+            w.ensurePolished()
+            if kind == "star":
+                w.resize(w.sizeHint())
+            pm = self._stamps[kind] = w.grab()
+            w.deleteLater()
+        return pm
+
+    @staticmethod
+    def _layout(info: dict, fm: QtGui.QFontMetrics):
+        """Chips [(texto, colores, ancho)], metadatos y su ancho; se miden una vez por
+        muestra (y fuente) y quedan en el info, no en cada repintado."""
+        key = (fm.height(), fm.averageCharWidth())
+        cached = info.get("_paint")
+        if cached is None or cached[0] != key:
+            chips = [(text, _CHIP_COLORS[tone], fm.horizontalAdvance(text) + 18) for text, tone in sample_chips(info)]
+            meta = sample_meta_text(info)
+            cached = info["_paint"] = (key, chips, meta, fm.horizontalAdvance(meta) if meta else 0)
+        return cached[1:]
+
+    def paint(self, p: QtGui.QPainter, option, index):
+        info = index.data(SampleModel.InfoRole)
+        if info is None or self._view.indexWidget(index) is not None:
+            return  # la fila materializada se pinta sola
+        # la fila entera queda en un pixmap (QPixmapCache): hover, scroll y cambios de
+        # fila actual repintan con un blit en vez de rehacer chips y textos
+        r = option.rect
+        fav = info["filename"] in self._favorites
+        dpr = p.device().devicePixelRatioF()
+        fm = option.fontMetrics
+        key = f'row:{info["path_str"]}:{r.width()}x{r.height()}:{fav:d}:{dpr}:{option.font.key()}'
+        pm = QtGui.QPixmap()
+        if not QtGui.QPixmapCache.find(key, pm):
+            pm = QtGui.QPixmap(round(r.width() * dpr), round(r.height() * dpr))
+            pm.setDevicePixelRatio(dpr)
+            pm.fill(QtCore.Qt.transparent)
+            pp = QtGui.QPainter(pm)
+            pp.setFont(option.font)
+            self._paint_row(pp, QtCore.QRect(0, 0, r.width(), r.height()), info, fm, fav)
+            pp.end()
+            QtGui.QPixmapCache.insert(key, pm)
+        p.drawPixmap(r.topLeft(), pm)
+
+    def _paint_row(self, p: QtGui.QPainter, r: QtCore.QRect, info: dict, fm: QtGui.QFontMetrics, fav: bool):
+        x, y, h = r.left(), r.top(), r.height()
+        p.save()
+        p.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        p.setPen(_ROW_BORDER)
+        p.setBrush(_ROW_BG)
+        p.drawRoundedRect(QtCore.QRectF(r).adjusted(0.5, 0.5, -0.5, -0.5), 12, 12)
+
+        # Drag | Play | Cover (mismas posiciones que el grid de SampleRow)
+        p.drawPixmap(x + 11, y + 21, self._stamp("drag"))
+        p.drawPixmap(x + 61, y + 20, self._stamp("▶"))
+        p.drawPixmap(x + 111, y + 11, cover_pixmap(info, 40))
+
+        # chips
+        cx = x + 161
+        chip_h = fm.height() + 6
+        cy = y + (h - chip_h) // 2
+        chips, meta, mw = self._layout(info, fm)
+        for text, (bg, fg, border), cw in chips:
+            p.setPen(border)
+            p.setBrush(bg)
+            p.drawRoundedRect(QtCore.QRectF(cx + 0.5, cy + 0.5, cw - 1, chip_h - 1), 10, 10)
+            p.setPen(fg)
+            p.drawText(QtCore.QRect(cx + 9, cy, cw - 18, chip_h), QtCore.Qt.AlignVCenter, text)
+            cx += cw + 6
+        tx = (cx - 6 if chips else cx) + 8
+
+        # derecha: estrella (sólo favoritos) y metadatos
+        right = r.right() - 10
+        if fav:
+            star = self._stamp("star")
+            right -= star.width()
+            p.drawPixmap(right, y + (h - star.height()) // 2, star)
+            right -= 8
+        if meta:
+            p.setPen(_META_FG)
+            p.drawText(QtCore.QRect(right - mw, y, mw, h), QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter, meta)
+            right -= mw + 8
+
+        p.setPen(_TITLE_FG)
+        title = fm.elidedText(info["title"], QtCore.Qt.ElideRight, max(0, right - tx))
+        p.drawText(QtCore.QRect(tx, y, max(0, right - tx), h), QtCore.Qt.AlignVCenter, title)
+        p.restore()
+
+
 # ----------------- fila de sugeridos -----------------
 class TagRow(QtWidgets.QWidget):
     includeRequested = QtCore.Signal(str)
@@ -1090,6 +2654,7 @@ class TagRow(QtWidgets.QWidget):
         self._tags = []
         self._ignored = set()
         self._hidden_for_menu = []
+        self._menu = None  # menú de tags que no entran, creado al abrirlo la primera vez
         self.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
         self.setMinimumHeight(28)
 
@@ -1104,62 +2669,90 @@ class TagRow(QtWidgets.QWidget):
         self.menuBtn.setStyleSheet("background:#232327;color:#e5e7eb;border:1px solid #3a3a44;border-radius:8px;padding:2px 10px;")
         self.menuBtn.clicked.connect(self._open_menu)
 
+        # layout fijo: [chips reciclados…] [stretch] [menú]; los chips sobrantes se ocultan
+        self._chip_pool = []
+        self._adv_cache = {}  # tag -> ancho del texto en px
+        self.wrap.addStretch(1)
+        self.wrap.addWidget(self.menuBtn)
+
+        self._rebuild_timer = QtCore.QTimer(self)
+        self._rebuild_timer.setSingleShot(True)
+        self._rebuild_timer.setInterval(80)
+        self._rebuild_timer.timeout.connect(self._rebuild)
+
     def setData(self, tags_with_count, ignored=set()):
-        self._tags = sorted([t for t in tags_with_count if t[0] not in ignored], key=lambda x: (-x[1], x[0]))
+        tags = sorted([t for t in tags_with_count if t[0] not in ignored], key=lambda x: (-x[1], x[0]))
+        if tags == self._tags and not self._rebuild_timer.isActive():
+            return  # mismas sugerencias: no se toca ningún chip
+        self._tags = tags
         self._ignored = set(ignored)
+        self._rebuild_timer.stop()
         self._rebuild()
 
     def resizeEvent(self, e):
-        self._rebuild()
+        self._rebuild_timer.start()
         super().resizeEvent(e)
 
+    def _chip(self, i: int) -> TagChip:
+        if i < len(self._chip_pool):
+            return self._chip_pool[i]
+        chip = TagChip("", "gray")
+        chip.includeRequested.connect(self.includeRequested.emit)
+        chip.excludeRequested.connect(self.excludeRequested.emit)
+        self.wrap.insertWidget(i, chip)
+        self._chip_pool.append(chip)
+        return chip
+
     def _rebuild(self):
-        while self.wrap.count():
-            it = self.wrap.takeAt(0)
-            w = it.widget()
-            if w:
-                w.setParent(None)
-                w.deleteLater()
-
-        fm = self.fontMetrics()
+        fm = None
+        adv = self._adv_cache
         menu_w = self.menuBtn.sizeHint().width() + 6
         avail = max(0, self.width() - menu_w)
         used = 0
-        shown = []
+        n_shown = 0
 
         for tag, cnt in self._tags:
-            chip_width = fm.horizontalAdvance(tag) + 22 + 26
+            w = adv.get(tag)
+            if w is None:
+                fm = fm or self.fontMetrics()
+                w = adv[tag] = fm.horizontalAdvance(tag)
+            chip_width = w + 22 + 26
             if used + chip_width > avail:
                 break
-            btn = TagChip(tag, "gray")
-            btn.setToolTip(f"{cnt} coincidencias · Clic: incluir · Der: excluir")
-            btn.includeRequested.connect(self.includeRequested.emit)
-            btn.excludeRequested.connect(self.excludeRequested.emit)
-            self.wrap.addWidget(btn)
+            chip = self._chip(n_shown)
+            if chip.raw_text != tag:
+                chip.setText(tag)
+            chip.setToolTip(f"{cnt} coincidencias · Clic: incluir · Der: excluir")
+            chip.setVisible(True)
             used += chip_width + 6
-            shown.append(tag)
+            n_shown += 1
 
-        self.wrap.addStretch(1)
-        self.wrap.addWidget(self.menuBtn)
-        self._hidden_for_menu = [t for t, _ in self._tags if t not in shown]
+        for chip in self._chip_pool[n_shown:]:
+            chip.setVisible(False)
+        self._hidden_for_menu = [t for t, _ in self._tags[n_shown:]]
 
     def _open_menu(self):
-        m = QtWidgets.QMenu(self)
-        m.setStyleSheet("QMenu{background:#121214;color:#e5e7eb;border:1px solid #2e2e33;} QMenu::item:selected{background:#1f2024;}")
+        # un solo QMenu con una sola conexión: antes cada apertura dejaba un menú
+        # vivo (hijo de la fila) con hasta 80 acciones y un slot por acción
+        m = self._menu
+        if m is None:
+            m = self._menu = QtWidgets.QMenu(self)
+            m.setStyleSheet("QMenu{background:#121214;color:#e5e7eb;border:1px solid #2e2e33;} QMenu::item:selected{background:#1f2024;}")
+            m.triggered.connect(lambda act: self.includeRequested.emit(act.data()))
+        m.clear()
         if not self._hidden_for_menu:
             m.addAction("(sin más tags)").setEnabled(False)
         for tag in self._hidden_for_menu[:80]:
-            act = QtGui.QAction(tag, m)
-
-            def trig(checked=False, t=tag):
-                self.includeRequested.emit(t)
-
-            act.triggered.connect(trig)
-            m.addAction(act)
+            m.addAction(tag).setData(tag)
         m.exec(self.menuBtn.mapToGlobal(QtCore.QPoint(self.menuBtn.width() // 2, self.menuBtn.height())))
 
 
 # ----------------- ventana principal -----------------
+SEARCH_DEBOUNCE_MS = 150  # ventana tras una tecla en la que las siguientes se agrupan
+LIST_LAYOUT_BATCH = 2000  # filas de la lista ubicadas por vuelta del event loop
+HOVER_PREFETCH_MS = 200   # mouse quieto sobre una fila este tiempo -> se precarga su audio
+
+
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self, samples_dir: Path):
         super().__init__()
@@ -1179,6 +2772,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.bridge.requestToggle.connect(self.playerWorker.toggle_pause, QtCore.Qt.QueuedConnection)
         self.bridge.requestStop.connect(self.playerWorker.stop_all, QtCore.Qt.QueuedConnection)
         self.bridge.requestVolume.connect(self.playerWorker.set_volume, QtCore.Qt.QueuedConnection)
+        self.bridge.requestPrefetch.connect(self.playerWorker.prefetch_path, QtCore.Qt.QueuedConnection)
 
         # recibir eventos del worker
         self.playerWorker.positionChanged.connect(self._worker_position)
@@ -1187,6 +2781,37 @@ class MainWindow(QtWidgets.QMainWindow):
         self.playerWorker.currentSourceChanged.connect(self._worker_current_changed)
         self.playerWorker.errorOccurred.connect(self._worker_error)
 
+        # picos de onda: se decodifican a demanda en un pool acotado
+        self.peaksPool = QtCore.QThreadPool(self)
+        self.peaksPool.setMaxThreadCount(min(8, os.cpu_count() or 1))
+        self.peaksSignals = PeaksJob.Signals(self)
+        self.peaksSignals.done.connect(self._on_peaks_ready)
+        self._peaks_pending = {}  # ruta -> (PeaksJob en cola, prioridad)
+        # con el scroll quieto se precalculan (baja prioridad) los picos de las filas visibles
+        self._viewport_timer = QtCore.QTimer(self)
+        self._viewport_timer.setSingleShot(True)
+        self._viewport_timer.setInterval(120)
+        self._viewport_timer.timeout.connect(self._warm_visible_peaks)
+        # los picos nuevos se persisten durante la sesión (no sólo al salir), en otro hilo
+        self._peaks_save_timer = QtCore.QTimer(self)
+        self._peaks_save_timer.setSingleShot(True)
+        self._peaks_save_timer.setInterval(30_000)
+        self._peaks_save_timer.timeout.connect(save_peaks_cache_async)
+
+        # escaneo de la carpeta en segundo plano (ver _load_samples); las señales no
+        # cuelgan de la ventana para que un escaneo en curso nunca emita sobre un
+        # objeto ya destruido
+        self.scanSignals = LibraryScanJob.Signals()
+        self.scanSignals.batch.connect(self._on_scan_batch)
+        self.scanSignals.finished.connect(self._on_scan_finished)
+        self._scan_gen = 0
+        self._scan_job = None
+        self._scanning = False
+        self._scan_timer = QtCore.QTimer(self)
+        self._scan_timer.setSingleShot(True)
+        self._scan_timer.setInterval(250)
+        self._scan_timer.timeout.connect(self._refresh_library)
+
         # filtros de búsqueda
         self.filter_keys = set()
         self.filter_scale = ""           # "Major" | "Minor" | ""
@@ -1203,9 +2828,26 @@ class MainWindow(QtWidgets.QMainWindow):
         cfg = load_config()
         self.favorites = set(cfg.get("favorites", []))
 
-        # navegación
-        self._current_row = None
-        self._ordered_visible_rows = []
+        # navegación (por índice de muestra en self.samples)
+        self._current = None
+        self._playing = False
+        self._hovered = None
+        self._row_widgets = {}  # índice -> SampleRow materializado (actual + bajo el mouse)
+        self._row_pool = []     # SampleRow soltados por la vista, listos para otra muestra
+        self._nav_dir = 1  # dirección de la última navegación (para precargar)
+        # la precarga espera a que se vacíe la cola de eventos: con ↑/↓ mantenido
+        # sólo se precarga la vecina de donde se detiene la navegación
+        self._prefetch_idx = None
+        self._prefetch_timer = QtCore.QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(0)
+        self._prefetch_timer.timeout.connect(self._prefetch_next)
+        # con el mouse, el próximo clic casi siempre es la fila bajo el cursor: se
+        # precarga cuando se detiene ahí (pasar por encima de filas no encola nada)
+        self._hover_prefetch_timer = QtCore.QTimer(self)
+        self._hover_prefetch_timer.setSingleShot(True)
+        self._hover_prefetch_timer.setInterval(HOVER_PREFETCH_MS)
+        self._hover_prefetch_timer.timeout.connect(self._prefetch_hovered)
         self._current_path = ""  # lo que el worker dice que suena
 
         self._build_ui()
@@ -1214,12 +2856,17 @@ class MainWindow(QtWidgets.QMainWindow):
         self._refresh_tag_suggestions()
         QtCore.QTimer.singleShot(0, self._refresh_tag_suggestions)
 
+        self._key_handlers = self._build_key_handlers()
         self.installEventFilter(self)
 
         # popover flotante
         self.popover = PlayerPopover(self)
-        self.scroll.verticalScrollBar().valueChanged.connect(self._reposition_popover)
-        self.scroll.horizontalScrollBar().valueChanged.connect(self._reposition_popover)
+        self.listView.verticalScrollBar().valueChanged.connect(self._reposition_popover)
+        self.listView.horizontalScrollBar().valueChanged.connect(self._reposition_popover)
+        # (lambdas: el int de la señal no debe llegar a QTimer.start como intervalo)
+        self.listView.verticalScrollBar().valueChanged.connect(lambda _: self._viewport_timer.start())
+        self.listView.verticalScrollBar().rangeChanged.connect(lambda *_: self._viewport_timer.start())
+        self.listModel.modelReset.connect(self._viewport_timer.start)
         self.resizeEvent = self._wrap_resize(self.resizeEvent)
 
         # popovers de filtros
@@ -1248,10 +2895,10 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setStyleSheet("""
             QMainWindow, QWidget { background-color: #121214; }
             QLineEdit { background:#1a1a1f; border:1px solid #2e2e33; border-radius:10px; padding:6px 10px; color:#e5e7eb; }
-            QScrollArea { border: none; }
+            QScrollArea, QListView { border: none; }
             QMenuBar { background:#121214; color:#e5e7eb; }
             QMenuBar::item:selected { background:#1f2024; }
-        """)
+        """ + SAMPLE_ROW_QSS + SELECTED_CHIP_QSS)
 
         menubar = self.menuBar()
         menubar.setNativeMenuBar(False)
@@ -1260,7 +2907,7 @@ class MainWindow(QtWidgets.QMainWindow):
         act_change.triggered.connect(self.change_folder)
 
         donate_btn = QtWidgets.QPushButton("Donar")
-        donate_btn.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        donate_btn.setCursor(_pointing_cursor())
         donate_btn.setStyleSheet("QPushButton{background:#16a34a;color:white;border:1px solid #15803d;border-radius:8px;padding:3px 10px;} QPushButton:hover{background:#22c55e;}")
         donate_btn.clicked.connect(lambda: QtGui.QDesktopServices.openUrl(QtCore.QUrl("https://www.gabrielgolker.com")))
         menubar.setCornerWidget(donate_btn, QtCore.Qt.TopRightCorner)
@@ -1293,11 +2940,18 @@ class MainWindow(QtWidgets.QMainWindow):
         self.search.setPlaceholderText("Buscar (tags, nombre)…")
         self.search.textChanged.connect(self._on_search_text)
         v.addWidget(self.search)
+        # debounce: un solo filtrado por ráfaga de tecleo
+        self._search_timer = QtCore.QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._do_apply_search)
 
         # filtros activos (include/exclude)
         self.activeWrap = QtWidgets.QHBoxLayout()
         self.activeWrap.setContentsMargins(0, 0, 0, 0)
         self.activeWrap.setSpacing(6)
+        self.activeWrap.addStretch(1)
+        self._active_chips = {}  # (tag, negado) -> SelectedChip
         activeW = QtWidgets.QWidget()
         activeW.setLayout(self.activeWrap)
         v.addWidget(activeW)
@@ -1316,15 +2970,27 @@ class MainWindow(QtWidgets.QMainWindow):
         tagRowW.setLayout(row)
         v.addWidget(tagRowW)
 
-        # lista
-        self.scroll = QtWidgets.QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.listHost = QtWidgets.QWidget()
-        self.listLayout = QtWidgets.QVBoxLayout(self.listHost)
-        self.listLayout.setContentsMargins(0, 0, 0, 0)
-        self.listLayout.setSpacing(8)
-        self.scroll.setWidget(self.listHost)
-        v.addWidget(self.scroll, 1)
+        # lista virtual: el delegate pinta las filas; sólo se crean widgets a demanda
+        self.listModel = SampleModel(self)
+        self.listView = QtWidgets.QListView()
+        self.listView.setModel(self.listModel)
+        delegate = SampleDelegate(self.favorites, self.listView)
+        delegate.rowReleased.connect(self._row_pool.append)
+        self.listView.setItemDelegate(delegate)
+        self.listView.setUniformItemSizes(True)
+        # el layout de QListView consulta el modelo fila por fila (~3 µs c/u desde
+        # Python): en tandas, un reset de 50k filas no congela la UI ~170 ms de golpe
+        self.listView.setLayoutMode(QtWidgets.QListView.Batched)
+        self.listView.setBatchSize(LIST_LAYOUT_BATCH)
+        self.listView.setSpacing(4)
+        self.listView.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        self.listView.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.listView.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.listView.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.listView.setMouseTracking(True)
+        self.listView.entered.connect(self._on_row_hovered)
+        self.listView.clicked.connect(lambda index: self._toggle_play(index.data(SampleModel.InfoRole)["idx"]))
+        v.addWidget(self.listView, 1)
 
         footer = QtWidgets.QLabel("© 2025 Gabriel Golker")
         footer.setAlignment(QtCore.Qt.AlignHCenter)
@@ -1339,7 +3005,7 @@ class MainWindow(QtWidgets.QMainWindow):
             QToolButton { background:#1a1a1f; color:#e5e7eb; border:1px solid #2e2e33; border-radius:12px; padding:6px 12px; }
             QToolButton:hover { background:#202027; }
         """)
-        btn.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        btn.setCursor(_pointing_cursor())
 
     # ---------- gestor de popovers (solo 1 abierto) ----------
     def _toggle_popover(self, popover, button):
@@ -1366,48 +3032,53 @@ class MainWindow(QtWidgets.QMainWindow):
         return QtCore.QRect(tl, br)
 
     # ---------- carga ----------
-    def _collect_files(self):
-        files = []
-        for root, _, names in os.walk(self.samples_dir):
-            for n in names:
-                p = Path(root) / n
-                if p.suffix.lower() in VALID_EXTS:
-                    files.append(p)
-        return sorted(files)
-
     def _load_samples(self):
-        self.rows = []
+        """Vacía la lista y escanea `samples_dir` en segundo plano (llega por tandas)."""
+        if self._scan_job is not None:
+            self._scan_job.cancel()
+        self._scan_gen += 1
+        self._scanning = True
+        # picos en cola de la carpeta anterior: ya no se van a mostrar
+        self.peaksPool.clear()
+        self._peaks_pending = {}
         self.samples = []
-        for p in self._collect_files():
-            meta = parse_from_path(p, self.samples_dir)
-            peaks, duration, sample_rate, bit_depth = read_pcm_waveform(p)
-            duration_ms = int(duration * 1000)
-            tags_flat = list(meta["genres"] + meta["generals"] + meta["specifics"])
-            if meta["key"]:
-                tags_flat.append(meta["key"])
-            if meta["sample_type"]:
-                tags_flat.append(meta["sample_type"])
-            if meta["bpm"]:
-                tags_flat.append(str(meta["bpm"]))
-            hay = strip_accents_lower(" ".join(tags_flat + [meta["title"], p.name]))
-            info = {
-                "path": p, "filename": p.name,
-                "genres": meta["genres"], "generals": meta["generals"], "specifics": meta["specifics"],
-                "title": meta["title"], "key": meta["key"],
-                "sample_type": meta["sample_type"], "bpm": meta["bpm"],
-                "haystack": hay, "tagset": set(tags_flat),
-                "peaks": peaks, "duration_ms": duration_ms,
-                "sample_rate": sample_rate, "bit_depth": bit_depth,
-            }
-            row = SampleRow(info, is_fav=(p.name in self.favorites))
-            row.playClicked.connect(self._toggle_play_row)
-            row.tagInclude.connect(self._include_tag)
-            row.tagExclude.connect(self._exclude_tag)
-            row.starToggled.connect(self._toggle_favorite)
-            self.rows.append(row)
+        self._info_by_path = {}
+        self.library = Library(self.samples, self.favorites)
+        self._visible_mask = self._filter_mask()
+        # el reset del modelo destruye las filas materializadas
+        self._row_widgets = {}
+        self._hovered = None
+        self.listModel.setSamples(self.samples)
+        self._scan_job = LibraryScanJob(self.samples_dir, self._scan_gen, self.scanSignals)
+        QtCore.QThreadPool.globalInstance().start(self._scan_job)
+
+    def _on_scan_batch(self, gen: int, infos: list):
+        if gen != self._scan_gen:
+            return  # tanda de una carpeta anterior
+        for info in infos:
+            info["idx"] = len(self.samples)
+            self._info_by_path[info["path_str"]] = info
             self.samples.append(info)
-            self.listLayout.addWidget(row)
-        self.listLayout.addStretch(1)
+        # la primera tanda se muestra ya; después se refresca como mucho cada 250 ms
+        if len(self.samples) == len(infos):
+            self._refresh_library()
+        elif not self._scan_timer.isActive():
+            self._scan_timer.start()
+
+    def _on_scan_finished(self, gen: int):
+        if gen != self._scan_gen:
+            return
+        self._scan_job = None
+        self._scanning = False
+        self._scan_timer.stop()
+        save_meta_cache()  # el escaneo ya terminó: no esperar al cierre para persistirlo
+        self._refresh_library()
+
+    def _refresh_library(self):
+        # las tandas del escaneo sólo se agregan al final de `samples`
+        self.library.extend(self.samples[self.library.n:], self.favorites)
+        self._apply_filters()
+        self._refresh_tag_suggestions()
 
     # ---------- favoritos ----------
     def _toggle_favorite(self, row: SampleRow):
@@ -1419,11 +3090,30 @@ class MainWindow(QtWidgets.QMainWindow):
         cfg = load_config()
         cfg["favorites"] = sorted(self.favorites)
         save_config(cfg)
+        self.library.set_favorite(row.info["idx"], row.isFav)
         self._apply_filters()
 
     # ---------- filtros (texto/tags) ----------
     def _on_search_text(self, text: str):
-        self.search_tokens = [strip_accents_lower(t) for t in text.strip().split() if t]
+        if text.strip():
+            # la primera tecla de una ráfaga se aplica ya (filtrar cuesta poco); las
+            # siguientes se juntan en una sola pasada al vencer el debounce
+            if not self._search_timer.isActive():
+                self._do_apply_search()
+            self._search_timer.start()
+        else:
+            self._flush_search()  # borrar la búsqueda se aplica al instante
+
+    def _flush_search(self):
+        """Aplica ya una búsqueda pendiente del debounce (antes de navegar la lista)."""
+        self._search_timer.stop()
+        self._do_apply_search()
+
+    def _do_apply_search(self):
+        tokens = [strip_accents_lower(t) for t in self.search.text().split()]
+        if tokens == self.search_tokens:
+            return
+        self.search_tokens = tokens
         self._apply_filters()
         self._refresh_tag_suggestions()
 
@@ -1449,19 +3139,23 @@ class MainWindow(QtWidgets.QMainWindow):
         self._refresh_tag_suggestions()
 
     def _redraw_active_filters(self):
-        while self.activeWrap.count():
-            it = self.activeWrap.takeAt(0)
-            if it.widget():
-                it.widget().deleteLater()
-        for t in sorted(self.include_tags):
-            chip = SelectedChip(t, negate=False)
-            chip.removed.connect(self._remove_tag)
-            self.activeWrap.addWidget(chip)
-        for t in sorted(self.exclude_tags):
-            chip = SelectedChip(t, negate=True)
-            chip.removed.connect(self._remove_tag)
-            self.activeWrap.addWidget(chip)
-        self.activeWrap.addStretch(1)
+        # incremental: sólo se crean/borran los chips que cambiaron; el stretch queda al final
+        desired = [(t, False) for t in sorted(self.include_tags)] + [(t, True) for t in sorted(self.exclude_tags)]
+        keep = set(desired)
+        for key in [k for k in self._active_chips if k not in keep]:
+            chip = self._active_chips.pop(key)
+            self.activeWrap.removeWidget(chip)
+            chip.deleteLater()
+        for i, key in enumerate(desired):
+            chip = self._active_chips.get(key)
+            if chip is None:
+                chip = self._active_chips[key] = SelectedChip(key[0], negate=key[1])
+                chip.removed.connect(self._remove_tag)
+            elif self.activeWrap.indexOf(chip) == i:
+                continue
+            else:
+                self.activeWrap.removeWidget(chip)
+            self.activeWrap.insertWidget(i, chip)
 
     # ---------- filtros (Key/BPM/Tipo) ----------
     def _on_key_filter_changed(self, keys: set, scale: str):
@@ -1491,148 +3185,272 @@ class MainWindow(QtWidgets.QMainWindow):
         self._apply_filters()
 
     # ---------- aplicación de filtros y orden ----------
-    def _set_list_order(self, rows_in_order):
-        while self.listLayout.count():
-            self.listLayout.takeAt(0)
-        for r in rows_in_order:
-            self.listLayout.addWidget(r)
-        self.listLayout.addStretch(1)
+    def _set_list_order(self, order):
+        # mismo orden (p.ej. una tecla que no cambia resultados) → nada que rehacer
+        viewport = self.listView.viewport()
+        viewport.setUpdatesEnabled(False)
+        try:
+            if not self.listModel.setOrder(order):
+                return
+            # un reset (o quitar su fila) destruye el index widget: se olvida y se
+            # rearman actual y hover; con inserciones/borrados por tramos sobreviven
+            self._row_widgets = {
+                idx: row for idx, row in self._row_widgets.items()
+                if self.listView.indexWidget(self.listModel.index_of(idx)) is row}
+            for idx in (self._current, self._hovered):
+                if idx is not None and self.listModel.pos_of[idx] >= 0:
+                    self._materialize_row(idx)
+        finally:
+            viewport.setUpdatesEnabled(True)
+        row = self._current_row
+        if row is not None and self.popover.isVisible():
+            self.popover.show_for_anchor(row.anchor_widget())
 
-    def _apply_filters(self):
-        visible_rows = []
-        for i, row in enumerate(self.rows):
-            s = self.samples[i]
-            visible = True
-
-            for tok in self.search_tokens:
-                if tok not in s["haystack"]:
-                    visible = False
-                    break
+    def _filter_mask(self) -> np.ndarray:
+        return self.library.mask(
+            self.search_tokens, self.include_tags, self.exclude_tags, self.filter_type,
+            self.filter_keys, self.filter_bpm_min, self.filter_bpm_max, self.filter_bpm_exact)
 
-            if visible and self.include_tags and not self.include_tags.issubset(s["tagset"]):
-                visible = False
-            if visible and self.exclude_tags and self.exclude_tags.intersection(s["tagset"]):
-                visible = False
-
-            if visible and self.filter_type and s.get("sample_type") != self.filter_type:
-                visible = False
-            if visible and self.filter_keys:
-                if not s.get("key") or s["key"] not in self.filter_keys:
-                    visible = False
-
-            bpm = int(s.get("bpm") or 0)
-            if visible and self.filter_bpm_exact:
-                if bpm != self.filter_bpm_exact:
-                    visible = False
-            elif visible:
-                if bpm and not (self.filter_bpm_min <= bpm <= self.filter_bpm_max):
-                    visible = False
-
-            row.setVisible(visible)
-            if visible:
-                visible_rows.append(row)
+    def _apply_filters(self):
+        mask = self._visible_mask = self._filter_mask()
 
         # Favoritos primero y luego alfabético por título (orden estable de navegación)
-        visible_rows.sort(key=lambda r: (0 if r.info["filename"] in self.favorites else 1,
-                                         strip_accents_lower(r.info["title"])))
-        hidden_rows = [r for r in self.rows if r not in visible_rows]
-
-        self._set_list_order(visible_rows + hidden_rows)
-        self._ordered_visible_rows = visible_rows
-        self.resLbl.setText(f"{len(visible_rows)} resultado" + ("" if len(visible_rows) == 1 else "s"))
+        order = self.library.order(mask)
+        self._set_list_order(order)
+        self.resLbl.setText(f"{len(order)} resultado" + ("" if len(order) == 1 else "s")
+                            + (" · cargando…" if self._scanning else ""))
 
         # Si la fila actual ya no está visible → detener el audio
-        if self._current_row and self._current_row not in visible_rows:
-            self._current_row.setPlaying(False)
-            self._current_row = None
+        if self._current is not None and not mask[self._current]:
+            self._set_playing(False)
+            self._current = None
             self.bridge.requestStop.emit()
             self.popover.hide()
 
     def _refresh_tag_suggestions(self):
-        freq = Counter()
-        for i, row in enumerate(self.rows):
-            if not row.isVisible():
-                continue
-            s = self.samples[i]
-            for t in s["tagset"]:
-                if t in self.include_tags or t in self.exclude_tags:
-                    continue
-                freq[t] += 1
-        self.tagRow.setData(list(freq.items()), ignored=self.include_tags | self.exclude_tags)
+        ignored = self.include_tags | self.exclude_tags
+        self.tagRow.setData(self.library.tag_counts(self._visible_mask, ignored), ignored=ignored)
+
+    # ---------- filas materializadas ----------
+    @property
+    def _current_row(self):
+        """SampleRow de la muestra actual, si está materializado."""
+        return self._row_widgets.get(self._current) if self._current is not None else None
+
+    def _materialize_row(self, idx: int) -> SampleRow:
+        row = self._row_widgets.get(idx)
+        if row is None:
+            info = self.samples[idx]
+            is_fav = info["filename"] in self.favorites
+            if self._row_pool:
+                # pasar el mouse de fila en fila recicla el widget: sin armar otro
+                # árbol de widgets ni re-aplicar estilos cada vez
+                row = self._row_pool.pop()
+                row.setInfo(info, is_fav)
+            else:
+                row = SampleRow(info, is_fav=is_fav)
+                row.playClicked.connect(self._toggle_play_row)
+                row.tagInclude.connect(self._include_tag)
+                row.tagExclude.connect(self._exclude_tag)
+                row.starToggled.connect(self._toggle_favorite)
+            if idx == self._current:
+                row.setPlaying(self._playing)
+            self.listView.setIndexWidget(self.listModel.index_of(idx), row)
+            self._row_widgets[idx] = row
+        return row
+
+    def _release_row(self, idx):
+        if idx is None or idx in (self._current, self._hovered):
+            return
+        row = self._row_widgets.pop(idx, None)
+        if row is not None:
+            index = self.listModel.index_of(idx)
+            # si la fila ya no está en la lista, la vista la soltó al quitarla
+            if index.isValid():
+                self.listView.closePersistentEditor(index)  # vuelve por rowReleased
+
+    def _on_row_hovered(self, index: QtCore.QModelIndex):
+        info = index.data(SampleModel.InfoRole)
+        if info is None:
+            return
+        prev, self._hovered = self._hovered, info["idx"]
+        if prev != self._hovered:
+            self._release_row(prev)
+            self._hover_prefetch_timer.start()
+        self._materialize_row(self._hovered)
+
+    def _set_playing(self, v: bool):
+        self._playing = v
+        row = self._current_row
+        if row is not None:
+            row.setPlaying(v)
 
     # ---------- reproducción / navegación ----------
-    def _ensure_visible(self, row: QtWidgets.QWidget):
-        try:
-            self.scroll.ensureWidgetVisible(row, xmargin=0, ymargin=8)
-        except Exception:
-            pass
+    def _ensure_visible(self, idx: int):
+        index = self.listModel.index_of(idx)
+        if not index.isValid():
+            return
+        if self.listView.visualRect(index).isValid():
+            self.listView.scrollTo(index, QtWidgets.QAbstractItemView.EnsureVisible)
+        else:
+            # el layout en tandas aún no llegó a esa fila: reintentar tras la próxima tanda
+            QtCore.QTimer.singleShot(0, lambda: idx == self._current and self._ensure_visible(idx))
 
     def _reposition_popover(self, *args):
         if self._current_row and self._current_row.isVisible():
             self.popover._reposition()
 
-    def _play_row(self, row: SampleRow):
+    def _play_sample(self, idx: int):
         # UI
-        if self._current_row and self._current_row is not row:
-            self._current_row.setPlaying(False)
-        self._current_row = row
-
-        peaks = row.info.get("peaks")
-        duration_ms = row.info.get("duration_ms", 1) or 1
-        sr = row.info.get("sample_rate", 0)
-        bd = row.info.get("bit_depth", 0)
-        self.popover.setInfo(peaks, sr, bd, duration_ms)
+        prev = self._current
+        if prev is not None and prev != idx:
+            self._set_playing(False)
+            self._current = idx
+            self._release_row(prev)
+        self._current = idx
+        row = self._materialize_row(idx)
+        info = self.samples[idx]
+
+        self._popover_set_info(info)
         self.popover.setProgressMs(0)
+        if not info.get("peaks_ready"):
+            self._request_peaks(info)
+        self._ensure_visible(idx)
         self.popover.show_for_anchor(row.anchor_widget())
-        self._ensure_visible(row)
 
         # Orden al hilo de audio (no bloquea UI)
-        self.bridge.requestPlay.emit(str(row.info["path"]))
+        self.bridge.requestPlay.emit(info["path_str"])
+        self._prefetch_idx = idx
+        self._prefetch_timer.start()
+
+    def _prefetch_next(self):
+        """Precarga en el player libre la fila siguiente en la dirección de navegación."""
+        idx = self._prefetch_idx
+        if idx is None or idx != self._current:
+            return
+        order = self.listModel.order
+        pos = int(self.listModel.pos_of[idx]) + self._nav_dir
+        if self.listModel.pos_of[idx] >= 0 and 0 <= pos < len(order):
+            self.bridge.requestPrefetch.emit(self.samples[order[pos]]["path_str"])
+
+    def _prefetch_hovered(self):
+        idx = self._hovered
+        if idx is not None and idx != self._current:
+            self.bridge.requestPrefetch.emit(self.samples[idx]["path_str"])
+
+    def _popover_set_info(self, info: dict):
+        duration_ms = info.get("duration_ms", 1) or 1
+        self.popover.setInfo(info.get("peaks"), info.get("sample_rate", 0), info.get("bit_depth", 0), duration_ms)
+
+    # ---- Picos de onda (pool en segundo plano) ----
+    PEAKS_PRIORITY_PLAY = 1   # la muestra que suena pasa delante de la cola
+    PEAKS_PRIORITY_WARM = -1  # filas visibles: sólo cuando el pool está libre
+
+    def _request_peaks(self, info: dict, priority: int = PEAKS_PRIORITY_PLAY):
+        key = info["path_str"]
+        pending = self._peaks_pending.get(key)
+        if pending is not None:
+            job, prio = pending
+            # si estaba en cola como "visible" y ahora suena, se adelanta
+            if prio >= priority or not self.peaksPool.tryTake(job):
+                return
+        job = PeaksJob(Path(info["path_str"]), self.peaksSignals)
+        self._peaks_pending[key] = (job, priority)
+        self.peaksPool.start(job, priority)
+
+    def _visible_sample_indices(self) -> list:
+        """Índices de muestra de las filas que hoy se ven en la lista."""
+        view = self.listView
+        vp = view.viewport().rect()
+        step = max(1, SampleDelegate.ROW_HEIGHT // 2)
+        out = []
+        for y in range(vp.top(), vp.bottom() + 1, step):
+            index = view.indexAt(QtCore.QPoint(vp.center().x(), y))
+            if index.isValid():
+                idx = int(self.listModel.order[index.row()])
+                if not out or out[-1] != idx:
+                    out.append(idx)
+        return out
+
+    def _warm_visible_peaks(self):
+        visible = dict.fromkeys(self.samples[idx]["path_str"] for idx in self._visible_sample_indices())
+        # filas que ya salieron de la vista: su lectura en cola se descarta
+        for key, (job, prio) in list(self._peaks_pending.items()):
+            if prio == self.PEAKS_PRIORITY_WARM and key not in visible and self.peaksPool.tryTake(job):
+                del self._peaks_pending[key]
+        for key in visible:
+            info = self._info_by_path[key]
+            if not info.get("peaks_ready"):
+                self._request_peaks(info, self.PEAKS_PRIORITY_WARM)
+
+    def _on_peaks_ready(self, path: str, peaks, duration: float, sample_rate: int, bit_depth: int):
+        self._peaks_pending.pop(path, None)
+        if not self._peaks_save_timer.isActive():
+            self._peaks_save_timer.start()
+        info = self._info_by_path.get(path)
+        if info is None:
+            return
+        info.update(peaks=peaks, duration_ms=int(duration * 1000),
+                    sample_rate=sample_rate, bit_depth=bit_depth, peaks_ready=True)
+        if self._current == info["idx"]:
+            self._popover_set_info(info)
 
     def _toggle_play_row(self, row: SampleRow):
-        if self._current_row is row and self._current_path:
+        self._toggle_play(row.info["idx"])
+
+    def _toggle_play(self, idx: int):
+        if self._current == idx and self._current_path:
             self.bridge.requestToggle.emit()
+            row = self._materialize_row(idx)
+            self._ensure_visible(idx)
             self.popover.show_for_anchor(row.anchor_widget())
-            self._ensure_visible(row)
             return
-        self._play_row(row)
+        self._play_sample(idx)
 
     def _move_selection(self, delta: int):
-        rows = self._ordered_visible_rows or [r for r in self.rows if r.isVisible()]
-        if not rows:
+        order = self.listModel.order
+        if not len(order):
             return
-        if self._current_row is None or self._current_row not in rows:
-            target = rows[0] if delta >= 0 else rows[-1]
+        self._nav_dir = -1 if delta < 0 else 1
+        pos = int(self.listModel.pos_of[self._current]) if self._current is not None else -1
+        if pos < 0:
+            target = order[0] if delta >= 0 else order[-1]
         else:
-            idx = rows.index(self._current_row)
-            idx = max(0, min(len(rows) - 1, idx + delta))
-            target = rows[idx]
-        self._play_row(target)
+            target = order[max(0, min(len(order) - 1, pos + delta))]
+        self._play_sample(int(target))
 
     # ---- Callbacks desde el hilo de audio ----
     def _worker_current_changed(self, path: str):
         self._current_path = path
         # Marcar playing sólo si coincide la fila
-        if self._current_row:
-            is_current = path and (str(self._current_row.info["path"]) == path)
-            self._current_row.setPlaying(bool(is_current))
+        if self._current is not None:
+            is_current = path and (self.samples[self._current]["path_str"] == path)
+            self._set_playing(bool(is_current))
+
+    def _worker_in_sync(self) -> bool:
+        """
+        El hilo de audio ya confirmó la muestra actual. Sus señales llegan en cola y
+        en orden: hasta ese currentSourceChanged, posición/estado son de la anterior.
+        """
+        return self._current is not None and self._current_path == self.samples[self._current]["path_str"]
 
     def _worker_position(self, pos_ms: int):
-        self.popover.setProgressMs(pos_ms)
+        if self._worker_in_sync():
+            self.popover.setProgressMs(pos_ms)
 
     def _worker_state(self, st: int):
-        if not self._current_row:
+        if self._current is None:
             return
         if st == int(QtMultimedia.QMediaPlayer.PlayingState):
-            self._current_row.setPlaying(True)
+            self._set_playing(True)
         elif st in (int(QtMultimedia.QMediaPlayer.PausedState), int(QtMultimedia.QMediaPlayer.StoppedState)):
             # Stopped puede llegar después de un cambio; sólo apago si ya no hay current
-            self._current_row.setPlaying(bool(self._current_path))
+            self._set_playing(bool(self._current_path))
 
     def _worker_status(self, status: int):
         # EndOfMedia → reset visual
-        if status == int(QtMultimedia.QMediaPlayer.EndOfMedia) and self._current_row:
-            self._current_row.setPlaying(False)
+        if status == int(QtMultimedia.QMediaPlayer.EndOfMedia) and self._worker_in_sync():
+            self._set_playing(False)
             self.popover.setProgressMs(0)
 
     def _worker_error(self, msg: str):
@@ -1640,49 +3458,77 @@ class MainWindow(QtWidgets.QMainWindow):
         QtWidgets.QToolTip.showText(self.mapToGlobal(QtCore.QPoint(20, 20)), f"Audio error: {msg}")
 
     # ---------- teclado + cierre por clic fuera ----------
+    # el filtro está instalado en toda la app: corre para cada evento (pintado,
+    # timers, mouse…), así que sale con una sola comparación de tipo
+    _KEY_PRESS = QtCore.QEvent.KeyPress
+    _MOUSE_PRESSES = frozenset((QtCore.QEvent.MouseButtonPress, QtCore.QEvent.MouseButtonDblClick))
+    _TEXT_WIDGETS = (QtWidgets.QLineEdit, QtWidgets.QTextEdit, QtWidgets.QPlainTextEdit)
+
+    def _build_key_handlers(self) -> dict:
+        """tecla -> handler(is_text) que devuelve True si consume el evento."""
+        return {
+            QtCore.Qt.Key_Down: self._key_down,
+            QtCore.Qt.Key_Up: self._key_up,
+            QtCore.Qt.Key_Enter: self._key_enter,
+            QtCore.Qt.Key_Return: self._key_enter,
+            QtCore.Qt.Key_Space: self._key_space,
+            QtCore.Qt.Key_Escape: self._key_escape,
+        }
+
     def eventFilter(self, obj, ev):
-        if ev.type() == QtCore.QEvent.KeyPress:
-            key = ev.key()
-            focus = QtWidgets.QApplication.focusWidget()
-            is_text = isinstance(focus, (QtWidgets.QLineEdit, QtWidgets.QTextEdit, QtWidgets.QPlainTextEdit))
-
-            if key == QtCore.Qt.Key_Down:
-                self._move_selection(+1)
-                return True
-            if key == QtCore.Qt.Key_Up:
-                self._move_selection(-1)
-                return True
-
-            if key in (QtCore.Qt.Key_Enter, QtCore.Qt.Key_Return):
-                if not is_text:
-                    rows = self._ordered_visible_rows or [r for r in self.rows if r.isVisible()]
-                    target = self._current_row or (rows[0] if rows else None)
-                    if target:
-                        self._toggle_play_row(target)
-                    return True
-                return False
-            if key == QtCore.Qt.Key_Space:
-                if not is_text:
-                    rows = self._ordered_visible_rows or [r for r in self.rows if r.isVisible()]
-                    if self._current_row is None and rows:
-                        self._play_row(rows[0])
-                    elif self._current_row:
-                        self._toggle_play_row(self._current_row)
-                    return True
+        et = ev.type()
+        if et == self._KEY_PRESS:
+            handler = self._key_handlers.get(ev.key())
+            if handler is None:
                 return False
-            if key == QtCore.Qt.Key_Escape:
+            return handler(isinstance(QtWidgets.QApplication.focusWidget(), self._TEXT_WIDGETS))
+        if et in self._MOUSE_PRESSES and self._active_popover and self._active_popover.isVisible():
+            gp = ev.globalPosition().toPoint() if hasattr(ev, "globalPosition") else ev.globalPos()
+            pop_rect = self._global_rect(self._active_popover)
+            btn_rect = self._global_rect(self._active_button) if self._active_button else QtCore.QRect()
+            if not (pop_rect.contains(gp) or btn_rect.contains(gp)):
                 self._close_active_popover()
-                return True
-
-        if ev.type() in (QtCore.QEvent.MouseButtonPress, QtCore.QEvent.MouseButtonDblClick):
-            if self._active_popover and self._active_popover.isVisible():
-                gp = ev.globalPosition().toPoint() if hasattr(ev, "globalPosition") else ev.globalPos()
-                pop_rect = self._global_rect(self._active_popover)
-                btn_rect = self._global_rect(self._active_button) if self._active_button else QtCore.QRect()
-                if not (pop_rect.contains(gp) or btn_rect.contains(gp)):
-                    self._close_active_popover()
         return False
 
+    def _flush_pending_search(self):
+        if self._search_timer.isActive():
+            self._flush_search()  # navegar sobre la lista ya filtrada, no la anterior
+
+    def _key_down(self, is_text: bool) -> bool:
+        self._flush_pending_search()
+        self._move_selection(+1)
+        return True
+
+    def _key_up(self, is_text: bool) -> bool:
+        self._flush_pending_search()
+        self._move_selection(-1)
+        return True
+
+    def _key_enter(self, is_text: bool) -> bool:
+        self._flush_pending_search()
+        if is_text:
+            return False
+        order = self.listModel.order
+        target = self._current if self._current is not None else (int(order[0]) if len(order) else None)
+        if target is not None:
+            self._toggle_play(target)
+        return True
+
+    def _key_space(self, is_text: bool) -> bool:
+        if is_text:
+            return False
+        self._flush_pending_search()
+        order = self.listModel.order
+        if self._current is None and len(order):
+            self._play_sample(int(order[0]))
+        elif self._current is not None:
+            self._toggle_play(self._current)
+        return True
+
+    def _key_escape(self, is_text: bool) -> bool:
+        self._close_active_popover()
+        return True
+
     def _wrap_resize(self, original_resize_event):
         def handler(ev):
             original_resize_event(ev)
@@ -1700,20 +3546,22 @@ class MainWindow(QtWidgets.QMainWindow):
             cfg = load_config()
             cfg["samples_dir"] = str(self.samples_dir)
             save_config(cfg)
-            while self.listLayout.count():
-                it = self.listLayout.takeAt(0)
-                if it.widget():
-                    it.widget().deleteLater()
+            # los índices de la carpeta anterior dejan de valer
+            self._current = None
+            self._playing = False
+            self.bridge.requestStop.emit()
+            self.popover.hide()
             self._load_samples()
             self._apply_filters()
             self._refresh_tag_suggestions()
-            if not (self._current_row and self._current_row.isVisible()):
-                self._current_row = None
-                self.bridge.requestStop.emit()
-                self.popover.hide()
 
     # ---------- cierre limpio ----------
     def closeEvent(self, e: QtGui.QCloseEvent):
+        if self._scan_job is not None:
+            self._scan_job.cancel()
+        # sin trabajos de picos en cola ni corriendo cuando se destruyan sus señales
+        self.peaksPool.clear()
+        self.peaksPool.waitForDone(1000)
         try:
             self.bridge.requestStop.emit()
             QtCore.QMetaObject.invokeMethod(self.playerWorker, "shutdown", QtCore.Qt.QueuedConnection)
@@ -1783,6 +3631,7 @@ def main():
     app = QtWidgets.QApplication(sys.argv)
     app.setApplicationName(APP_NAME)
     app.setOrganizationName(APP_ORG)
+    QtGui.QPixmapCache.setCacheLimit(64 * 1024)  # KB; carátulas de la lista
     app.setStyleSheet(qdarkstyle.load_stylesheet(qt_api="pyside6") + "\nQWidget{background-color:#121214;}")
 
     cfg = load_config()